@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""Offline benchmarks of the (de)serialization pipeline.
+
+Every case is run against synthetic documents (see ``fixtures.py``) of 1k, 10k and 100k
+resources, no requests are made. The throughput is the best of ``--repeat`` runs, the peak
+memory of building the input and running the case once is measured with ``tracemalloc``.
+
+    python benchmarks/bench_pipeline.py                 # print the results
+    python benchmarks/bench_pipeline.py --record        # record the baselines
+    python benchmarks/bench_pipeline.py --check         # compare against the baselines
+
+Throughput depends on the machine, so baselines are only comparable to results of the same
+machine and are not committed (``baselines.local.json`` is ignored by git). Record them
+before changing the hot path and check against them afterwards.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+from fixtures import activities_document, reports_document
+from libtimed import TimedAPIClient, codec, transforms
+
+BASELINES = Path(__file__).with_name("baselines.local.json")
+SIZES = (1_000, 10_000, 100_000)
+
+
+def _client() -> TimedAPIClient:
+    return TimedAPIClient("token", "http://timed.invalid", "api/v1")
+
+
+def _documents(build: Callable[[int], dict], size: int) -> Callable[[], dict]:
+    """Return a factory of fresh copies of a document, deserialization mutates them."""
+    text = json.dumps(build(size))
+    return lambda: json.loads(text)
+
+
+def deserialize(client, size, lazy=False, typed=False):
+    documents = _documents(reports_document, size)
+
+    def setup():
+        return documents()
+
+    def run(document):
+        data = client.reports._parse_get_response(document, None, lazy=lazy)
+        return client.reports._to_records(data) if typed else data
+
+    return setup, run
+
+
+def deserialize_activities(client, size):
+    documents = _documents(activities_document, size)
+    return documents, lambda document: client.activities._parse_get_response(document, None)
+
+
+def decode(client, size):
+    content = json.dumps(reports_document(size)).encode()
+    return lambda: content, codec.loads
+
+
+def parse_attributes(client, size):
+    attributes = [
+        {"comment": f"Report {i}", "date": date(2024, 1, 1), "duration": timedelta(hours=1)}
+        for i in range(size)
+    ]
+    return (
+        lambda: attributes,
+        lambda attributes: [client.reports._parse_attributes(a) for a in attributes],
+    )
+
+
+def parse_filters(client, size):
+    filters = [{"user": 1, "from_date": date(2024, 1, 1), "to_date": date(2024, 1, 31)}] * size
+    return lambda: filters, lambda filters: [client.reports._parse_filters(f) for f in filters]
+
+
+def transform_many(transform, values):
+    def factory(client, size):
+        batch = (values * (size // len(values) + 1))[:size]
+        return lambda: batch, transform.deserialize_many
+
+    return factory
+
+
+CASES = {
+    "decode": decode,
+    "deserialize": deserialize,
+    "deserialize-lazy": lambda client, size: deserialize(client, size, lazy=True),
+    "deserialize-typed": lambda client, size: deserialize(client, size, typed=True),
+    "deserialize-activities": deserialize_activities,
+    "parse-attributes": parse_attributes,
+    "parse-filters": parse_filters,
+    "date-deserialize": transform_many(
+        transforms.Date, [(date(2024, 1, 1) + timedelta(days=d)).isoformat() for d in range(365)]
+    ),
+    "time-deserialize": transform_many(
+        transforms.Time(True), [f"{h:02d}:{m:02d}:00" for h in range(24) for m in range(60)]
+    ),
+    "duration-deserialize": transform_many(
+        transforms.Duration, [f"{h:02d}:{m:02d}:00" for h in range(12) for m in range(0, 60, 15)]
+    ),
+}
+
+
+def measure(case: str, size: int, repeat: int) -> dict:
+    setup, run = CASES[case](_client(), size)
+    timings = []
+    for _ in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        run(argument)
+        timings.append(time.perf_counter() - start)
+
+    # the input is part of the peak, deserialization mostly replaces values in place
+    tracemalloc.start()
+    result = run(setup())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+
+    return {"items_per_second": round(size / min(timings)), "peak_bytes": peak}
+
+
+def compare(results: dict, baselines: dict, tolerance: float) -> list[str]:
+    """Return the regressions of the results compared to the baselines."""
+    regressions = []
+    for key, result in results.items():
+        if (baseline := baselines.get(key)) is None:
+            continue
+        if result["items_per_second"] < baseline["items_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{key}: {result['items_per_second']} items/s, "
+                f"baseline {baseline['items_per_second']} items/s"
+            )
+        if result["peak_bytes"] > baseline["peak_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"{key}: peak {result['peak_bytes']} bytes, baseline {baseline['peak_bytes']} bytes"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=SIZES)
+    parser.add_argument("--cases", type=lambda v: v.split(","), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--check", action="store_true", help="fail on regressions")
+    action.add_argument("--record", action="store_true", help="store results as baselines")
+    args = parser.parse_args()
+
+    results = {}
+    for case in args.cases:
+        for size in args.sizes:
+            result = results[f"{case}[{size}]"] = measure(case, size, args.repeat)
+            print(
+                f"{case + f'[{size}]':<32} {result['items_per_second']:>12,} items/s"
+                f" {result['peak_bytes'] / 2**20:>10.1f} MiB peak"
+            )
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    if args.check and not baselines:
+        print(f"\nNo baselines in {BASELINES}, record them with --record", file=sys.stderr)
+        return 1
+    if args.record:
+        BASELINES.write_text(json.dumps(baselines | results, indent=2, sort_keys=True) + "\n")
+    elif args.check and (regressions := compare(results, baselines, args.tolerance)):
+        print("\nRegressions:", *regressions, sep="\n", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Synthetic JSON:API documents shaped like the responses of timed.
+
+Reports point to a task and a user, the included tasks point to their project and the
+projects to their customer, so deserializing a document walks the whole graph.
+"""
+
+import random
+from datetime import date, timedelta
+
+FIRST_DATE = date(2024, 1, 1)
+
+
+def _resource(type: str, id: int, attributes: dict, relationships: dict | None = None) -> dict:
+    resource = {"type": type, "id": str(id), "attributes": attributes}
+    if relationships is not None:
+        resource["relationships"] = {
+            name: {"data": {"type": related_type, "id": str(related_id)}}
+            for name, (related_type, related_id) in relationships.items()
+        }
+    return resource
+
+
+def _duration(minutes: int) -> str:
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:00"
+
+
+def reports_document(
+    count: int,
+    seed: int = 0,
+    first_date: date = FIRST_DATE,
+    days: int = 365,
+    user_count: int | None = None,
+) -> dict:
+    """Return a document with ``count`` reports including their task, project and customer.
+
+    There is roughly one task per 20 reports, one project per 5 tasks and one customer per
+    5 projects. Reports are spread over ``days`` days starting at ``first_date`` and, unless
+    ``user_count`` is given, one user per 1000 reports. The document is deterministic for
+    the same arguments.
+    """
+    rng = random.Random(seed)
+    task_count = max(count // 20, 1)
+    project_count = max(task_count // 5, 1)
+    customer_count = max(project_count // 5, 1)
+    user_count = user_count or max(count // 1000, 1)
+
+    data = [
+        _resource(
+            "reports",
+            id,
+            {
+                "comment": f"Report {id}",
+                "date": (first_date + timedelta(days=rng.randrange(days))).isoformat(),
+                "duration": _duration(rng.randrange(1, 40) * 15),
+                "review": rng.random() < 0.05,
+                "not-billable": rng.random() < 0.1,
+            },
+            {
+                "task": ("tasks", rng.randrange(task_count)),
+                "user": ("users", rng.randrange(user_count)),
+            },
+        )
+        for id in range(count)
+    ]
+    included = [
+        *(
+            _resource(
+                "tasks",
+                id,
+                {"name": f"Task {id}", "archived": False},
+                {"project": ("projects", id % project_count)},
+            )
+            for id in range(task_count)
+        ),
+        *(
+            _resource(
+                "projects",
+                id,
+                {"name": f"Project {id}", "archived": False},
+                {"customer": ("customers", id % customer_count)},
+            )
+            for id in range(project_count)
+        ),
+        *(
+            _resource("customers", id, {"name": f"Customer {id}", "archived": False})
+            for id in range(customer_count)
+        ),
+        *(
+            _resource("users", id, {"username": f"user{id}", "first-name": "", "last-name": ""})
+            for id in range(user_count)
+        ),
+    ]
+    return {
+        "data": data,
+        "included": included,
+        "meta": {"pagination": {"page": 1, "pages": 1, "count": count}},
+    }
+
+
+def activities_document(count: int, seed: int = 0) -> dict:
+    """Return a document with ``count`` finished activities and their included tasks."""
+    rng = random.Random(seed)
+    task_count = max(count // 20, 1)
+    data = []
+    for id in range(count):
+        start = rng.randrange(7 * 60, 17 * 60)
+        end = start + rng.randrange(1, 120)
+        data.append(
+            _resource(
+                "activities",
+                id,
+                {
+                    "comment": f"Activity {id}",
+                    "date": (FIRST_DATE + timedelta(days=rng.randrange(365))).isoformat(),
+                    "from-time": _duration(start),
+                    "to-time": _duration(end),
+                    "review": False,
+                    "not-billable": False,
+                },
+                {"task": ("tasks", rng.randrange(task_count))},
+            )
+        )
+    included = [
+        _resource("tasks", id, {"name": f"Task {id}", "archived": False})
+        for id in range(task_count)
+    ]
+    return {"data": data, "included": included}
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""End-to-end load test of ``TimedAPIClient`` against the in-process fake timed server.
+
+Every workload is run ``--iterations`` times by each of ``--concurrency`` threads sharing
+one client. Per workload the p50/p99 latency, the requests, new connections, bytes and
+injected errors per operation and the number of operations which raised are reported. A
+workload served from the cache makes less than one request per operation. With ``--phases``,
+the milliseconds per operation spent waiting for the network or cache, decoding and
+deserializing are reported as well. Nothing leaves the machine.
+
+    python benchmarks/load.py --latency 0.005 --concurrency 4
+    python benchmarks/load.py --error-rate 0.05 --workloads activities.start
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from fixtures import reports_document
+from libtimed import TimedAPIClient, columnar
+from libtimed.instrumentation import PHASES, Stats
+from libtimed.testing import FakeTimedServer
+
+ME_ID = "0"
+REPORT_INCLUDE = "task,task.project,task.project.customer"
+
+
+def _workloads(today: date) -> dict[str, Callable[[TimedAPIClient], object]]:
+    return {
+        "users.me": lambda client: client.users.me,
+        "reports.get": lambda client: client.reports.get(include=REPORT_INCLUDE, cached=False),
+        "reports.get (cached)": lambda client: client.reports.get(include=REPORT_INCLUDE),
+        "reports.get_all": lambda client: client.reports.get_all(
+            {"date": today}, REPORT_INCLUDE, cached=False
+        ),
+        "reports.get_all (4 workers)": lambda client: client.reports.get_all(
+            {"date": today}, REPORT_INCLUDE, max_workers=4, cached=False
+        ),
+        "reports.get_all (sparse)": lambda client: client.reports.get_all(
+            {"date": today}, REPORT_INCLUDE, cached=False, fields=columnar.REPORT_FIELDS
+        ),
+        "overtime.get": lambda client: client.overtime.get(),
+        "activities.start": lambda client: client.activities.start(
+            attributes={"comment": "load test"}, relationships={"task": "1"}
+        ),
+        "activities.stop": lambda client: client.activities.stop(),
+        "catalog.sync": lambda client: client.catalog.sync(force=True),
+    }
+
+
+def _seed(server: FakeTimedServer, reports: int, today: date) -> None:
+    document = reports_document(reports, first_date=today, days=1, user_count=1)
+    server.add(*document["data"], *document["included"])
+    server.add(
+        {
+            "type": "worktime-balances",
+            "id": f"{ME_ID}_{today.isoformat()}",
+            "attributes": {"date": today.isoformat(), "balance": "01:30:00"},
+            "relationships": {"user": {"data": {"type": "users", "id": ME_ID}}},
+        }
+    )
+
+
+def run(
+    server: FakeTimedServer,
+    client: TimedAPIClient,
+    workload: Callable[[TimedAPIClient], object],
+    iterations: int,
+    concurrency: int,
+    stats: Stats | None = None,
+) -> dict:
+    def operation(_):
+        start = time.perf_counter()
+        try:
+            workload(client)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    server.reset_stats()
+    if stats is not None:
+        stats.reset()
+    operations = iterations * concurrency
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        timings = list(executor.map(operation, range(operations)))
+    latencies = sorted(timing for timing in timings if timing is not None)
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    phases = dict.fromkeys(PHASES, 0.0)
+    for entry in (stats.snapshot() if stats is not None else {}).values():
+        for phase, seconds in entry["phases"].items():
+            phases[phase] += seconds * 1000 / operations
+    return {
+        "phases": phases,
+        "p50": percentiles[49] * 1000 if latencies else float("nan"),
+        "p99": percentiles[98] * 1000 if latencies else float("nan"),
+        "requests": server.stats["requests"] / operations,
+        "connections": server.stats["connections"] / operations,
+        "kib": (server.stats["bytes_sent"] + server.stats["bytes_received"]) / operations / 1024,
+        "errors": server.stats["errors"] / operations,
+        "failed": operations - len(latencies),
+    }
+
+
+def main() -> int:
+    today = date.today()
+    workloads = _workloads(today)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=1000, help="reports of the day")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--compress", action="store_true", help="gzip the responses")
+    parser.add_argument("--phases", action="store_true", help="break operations down by phase")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--workloads", type=lambda v: v.split(","), default=list(workloads))
+    args = parser.parse_args()
+
+    # keep the response cache of the client away from the user's cache
+    os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="libtimed-load-")
+    with FakeTimedServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        page_size=args.page_size,
+        me_id=ME_ID,
+        compress=args.compress,
+    ) as server:
+        _seed(server, args.reports, today)
+        stats = Stats() if args.phases else None
+        client = TimedAPIClient(
+            "token",
+            server.url,
+            server.api_namespace,
+            hooks=[stats] if stats else None,
+        )
+        phases = PHASES if args.phases else ()
+        print(
+            f"{'workload':<30} {'p50 ms':>9} {'p99 ms':>9} {'req/op':>8} {'conn/op':>8}"
+            f" {'KiB/op':>9} {'err/op':>7} {'failed':>7}"
+            + "".join(f" {phase:>11}" for phase in phases)
+        )
+        for name in args.workloads:
+            result = run(server, client, workloads[name], args.iterations, args.concurrency, stats)
+            print(
+                f"{name:<30} {result['p50']:>9.2f} {result['p99']:>9.2f}"
+                f" {result['requests']:>8.2f} {result['connections']:>8.2f}"
+                f" {result['kib']:>9.1f} {result['errors']:>7.2f} {result['failed']:>7}"
+                + "".join(f" {result['phases'][phase]:>11.2f}" for phase in phases)
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+
+import asyncio
+
+from libtimed import AsyncTimedAPIClient
+from libtimed.oidc import OIDCClient
+
+# API stuff
+URL = "https://timed.example.com"
+API_NAMESPACE = "api/v1"
+
+# Auth stuff
+CLIENT_ID = "timed-client-id"
+AUTH_ENDPOINT = "https://sso.example.com/auth/realms/example/protocol/openid-connect/auth"
+TOKEN_ENDPOINT = "https://sso.example.com/auth/realms/example/protocol/openid-connect/token"
+AUTH_PATH = "timedctl/auth"
+
+oidc_client = OIDCClient(CLIENT_ID, AUTH_ENDPOINT, TOKEN_ENDPOINT, AUTH_PATH)
+token = oidc_client.authorize()
+
+
+async def main():
+    async with AsyncTimedAPIClient(token, URL, API_NAMESPACE) as client:
+        reports, overtime = await asyncio.gather(
+            client.reports.get_all(include="task,task.project,task.project.customer"),
+            client.overtime.get(),
+        )
+        print(len(reports), overtime)
+
+
+asyncio.run(main())
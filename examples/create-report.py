@@ -19,34 +19,33 @@ oidc_client = OIDCClient(CLIENT_ID, AUTH_ENDPOINT, TOKEN_ENDPOINT, AUTH_PATH)
 token = oidc_client.authorize()
 client = TimedAPIClient(token, URL, API_NAMESPACE)
 
-customers = client.customers.get()
+# resolve customers, projects and tasks locally instead of requesting them one by one
+client.catalog.sync()
 
-customer_name = pyfzf.FzfPrompt().prompt(
-    [customer["attributes"]["name"] for customer in customers]
-)[0]
+customers = client.catalog.all("customers")
+
+customer_name = pyfzf.FzfPrompt().prompt([customer["name"] for customer in customers])[0]
 
 if not customer_name:
     exit()
 
-customer = next(
-    customer for customer in customers if customer["attributes"]["name"] == customer_name
-)
+customer = next(customer for customer in customers if customer["name"] == customer_name)
 
-projects = client.projects.get({"customer": customer["id"]})
+projects = client.catalog.children(customer)
 
-project_name = pyfzf.FzfPrompt().prompt([project["attributes"]["name"] for project in projects])
+project_name = pyfzf.FzfPrompt().prompt([project["name"] for project in projects])
 if not project_name:
     exit()
 
-project = next(project for project in projects if project["attributes"]["name"] == project_name[0])
-tasks = client.tasks.get({"project": project["id"]})
+project = next(project for project in projects if project["name"] == project_name[0])
+tasks = client.catalog.children(project)
 
-task_name = pyfzf.FzfPrompt().prompt([task["attributes"]["name"] for task in tasks])
+task_name = pyfzf.FzfPrompt().prompt([task["name"] for task in tasks])
 
 if not task_name:
     exit()
 
-task = next(task for task in tasks if task["attributes"]["name"] == task_name[0])
+task = next(task for task in tasks if task["name"] == task_name[0])
 
 
 duration = input("Task duration [HH:MM:SS]: ")
@@ -1,23 +1,68 @@
-from inspect import isclass
+import functools
+import hashlib
+from collections.abc import Callable, Iterable, MutableMapping
+from pathlib import Path
 
 import requests
-import requests_cache
 
-from libtimed import models
+from libtimed import codec, models
+from libtimed.cache import IdentityCache, LRUCache
+from libtimed.catalog import Catalog
+from libtimed.transport import Transport
+
+__all__ = ["AsyncTimedAPIClient", "TimedAPIClient", "Transport"]
+
+# name of the response cache database in the user's cache directory
+CACHE_NAME = "libtimed"
+
+
+def _cache_key(request, **kwargs) -> str:
+    """Return the requests_cache key of a request, scoped to its access token.
+
+    requests_cache leaves the ``Authorization`` header out of its keys, so clients with
+    different tokens sharing the response cache would get each other's responses.
+    """
+    from requests_cache import create_key
+
+    key = f"{create_key(request, **kwargs)} {request.headers.get('Authorization')}"
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def __getattr__(name):
+    # asyncio and httpx are only imported once the async client is used
+    if name == "AsyncTimedAPIClient":
+        from libtimed.aio import AsyncTimedAPIClient
+
+        return AsyncTimedAPIClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class TimedAPIClient:
-    def __init__(self, token, url, api_namespace):
+    def __init__(
+        self,
+        token,
+        url,
+        api_namespace,
+        identity_ttl: float | None = None,
+        memory_cache_size: int = 0,
+        memory_cache_ttl: float | None = None,
+        transport: Transport | None = None,
+        hooks: Iterable[Callable] | None = None,
+    ):
         self.token = token
         self.url = f"{url}/{api_namespace}/"
-        self.session = requests.Session()
-        self.session.headers["Authorization"] = f"Bearer {token}"
-        self.session.headers["Content-Type"] = "application/vnd.api+json"
-        self.cached_session = requests_cache.CachedSession(
-            "libtimed", expire_after=60 * 60 * 24, use_cache_dir=True
+        # connection pool, retries and timeouts shared by both sessions
+        self.transport = transport or Transport()
+        self.session = self._configure(requests.Session())
+        self._cache_indexes: dict[str, MutableMapping[str, str]] = {}
+        # optional in-memory tier holding deserialized responses in front of the cached session
+        self.memory_cache = (
+            LRUCache(memory_cache_size, memory_cache_ttl) if memory_cache_size else None
         )
-        self.cached_session.headers["Authorization"] = f"Bearer {token}"
-        self.cached_session.headers["Content-Type"] = "application/vnd.api+json"
+        # called with an Event of every model operation, see libtimed.instrumentation
+        self.hooks: list[Callable] = list(hooks or ())
+        # resolved identities (e.g. the current user) shared by all models
+        self.identity = IdentityCache(identity_ttl)
         # Models
         self.users = models.Users(self)
         self.reports = models.Reports(self)
@@ -27,10 +72,57 @@ class TimedAPIClient:
         self.tasks = models.Tasks(self)
         self.projects = models.Projects(self)
         # self.employments = models.Employments(self)
+        self.catalog = Catalog(self)
+
+        self._type_map = models.registry
+
+    @functools.cached_property
+    def cached_session(self) -> requests.Session:
+        """Session backed by the on-disk response cache, opened on first use."""
+        import requests_cache
+
+        return self._configure(
+            requests_cache.CachedSession(
+                CACHE_NAME, expire_after=60 * 60 * 24, use_cache_dir=True, key_fn=_cache_key
+            )
+        )
+
+    def cache_index(self, resource_name: str) -> MutableMapping[str, str]:
+        """Return the URLs of the cached responses of a resource type by their cache keys.
+
+        The index is stored next to the responses, so writes in any process can evict the
+        responses of a resource type without deserializing every cached response.
+        """
+        if (index := self._cache_indexes.get(resource_name)) is None:
+            from requests_cache.backends.sqlite import SQLiteDict
+
+            index = self._cache_indexes[resource_name] = SQLiteDict(
+                self.cached_session.cache.responses.db_path,
+                f"libtimed_keys_{resource_name.replace('-', '_')}",
+                serializer=None,
+            )
+        return index
+
+    def response_cache_exists(self) -> bool:
+        """Return whether there is a response cache, without opening it."""
+        if "cached_session" in self.__dict__:
+            return True
+        from platformdirs import user_cache_dir
+
+        return (Path(user_cache_dir()) / f"{CACHE_NAME}.sqlite").exists()
+
+    def set_token(self, token) -> None:
+        """Use another access token for all following requests, e.g. a renewed one."""
+        self.token = token
+        sessions = [self.session]
+        # the cached session picks up the token once it is opened
+        if "cached_session" in self.__dict__:
+            sessions.append(self.cached_session)
+        for session in sessions:
+            session.headers["Authorization"] = f"Bearer {token}"
 
-        self._type_map = {
-            getattr(models, model).resource_name: getattr(models, model)
-            for model in dir(models)
-            if isclass(getattr(models, model))
-            and issubclass(getattr(models, model), models.BaseModel)
-        }
+    def _configure(self, session: requests.Session) -> requests.Session:
+        session.headers["Authorization"] = f"Bearer {self.token}"
+        session.headers["Content-Type"] = "application/vnd.api+json"
+        session.headers["Accept-Encoding"] = codec.ACCEPT_ENCODING
+        return self.transport.mount(session)
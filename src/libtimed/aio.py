@@ -0,0 +1,305 @@
+"""Asyncio flavour of the client, it requires the optional ``httpx`` dependency."""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+
+from libtimed import codec, models, transforms
+from libtimed.cache import IdentityCache
+
+SYNC_ONLY_MESSAGE = "Only available on the synchronous TimedAPIClient!"
+
+
+def _query(params: dict | None) -> dict | None:
+    """Encode query parameters the same way requests does."""
+    if params is None:
+        return None
+    return {
+        key: str(value) if isinstance(value, bool) else value
+        for key, value in params.items()
+        if value is not None
+    }
+
+
+class AsyncModelMixin:
+    """Turn a model into a coroutine based one, reusing its declarations and transforms."""
+
+    @classmethod
+    @property
+    def resource_name(cls):
+        return models.resource_name_of(cls.__name__.removeprefix("Async"))
+
+    async def get(
+        self,
+        filters=None,
+        include: str | None = None,
+        id: str | int | None = None,
+        raw=False,
+        fields: dict[str, Iterable[str]] | None = None,
+    ) -> dict:
+        filters = await self._resolve_properties(self.__class__.filters, filters)
+        url, params = self._get_request(filters, include, id, fields)
+        resp = await self._fetch(url, params)
+        return self._parse_get_response(resp, id, raw)
+
+    async def iter(
+        self,
+        filters=None,
+        include: str | None = None,
+        page_size: int = 100,
+        fields: dict[str, Iterable[str]] | None = None,
+    ) -> AsyncIterator[dict]:
+        """Lazily iterate over all resources, fetching and deserializing one page at a time."""
+        filters = await self._resolve_properties(self.__class__.filters, filters)
+        url, params = self.url, self._page_params(filters, include, page_size, fields)
+        while url:
+            page = await self._fetch(url, params)
+            for item in self._deserialize_data(page.get("data") or [], page.get("included", [])):
+                yield item
+            # the next link already contains all query parameters
+            url, params = (page.get("links") or {}).get("next"), None
+
+    async def get_all(
+        self,
+        filters=None,
+        include: str | None = None,
+        page_size: int = 100,
+        max_concurrency: int = 4,
+        fields: dict[str, Iterable[str]] | None = None,
+    ) -> list[dict]:
+        """Fetch every page of the collection and return all resources in order.
+
+        Once the first page reveals the page count in ``meta.pagination``, the remaining
+        pages are gathered concurrently with at most ``max_concurrency`` requests in flight.
+        """
+        filters = await self._resolve_properties(self.__class__.filters, filters)
+        params = self._page_params(filters, include, page_size, fields)
+        first_page = await self._fetch(self.url, params)
+        page_count = ((first_page.get("meta") or {}).get("pagination") or {}).get("pages", 1)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_page(number):
+            async with semaphore:
+                return await self._fetch(self.url, {**params, "page[number]": number})
+
+        pages = [
+            first_page,
+            *await asyncio.gather(*map(fetch_page, range(2, page_count + 1))),
+        ]
+        return self._deserialize_pages(pages, models.IdentityMap(self.client))
+
+    async def post(self, attributes: dict | None = None, relationships: dict | None = None):
+        self._check_writable()
+        relationships = await self._resolve_properties(self.__class__.relationships, relationships)
+        json = self._parse_post_json(attributes, relationships)
+        return await self.client.session.post(self.url, json=json)
+
+    async def patch(self, id, attributes: dict | None = None, relationships: dict | None = None):
+        self._check_writable()
+        relationships = await self._resolve_properties(self.__class__.relationships, relationships)
+        json = self._parse_patch_json(id, attributes, relationships)
+        return await self.client.session.patch(f"{self.url}/{id}", json=json)
+
+    async def delete(self, id):
+        return await self.client.session.delete(f"{self.url}/{id}")
+
+    async def _fetch(self, url: str, params: dict | None) -> dict:
+        return codec.loads((await self.client.session.get(url, params=_query(params))).content)
+
+    async def _resolve_properties(self, declarations: list[tuple], passed: dict | None) -> dict:
+        """Resolve relationship properties (e.g. the current user) without blocking.
+
+        The synchronous transforms would resolve them through a blocking request, so they
+        are awaited here and passed on as plain ids instead.
+        """
+        passed = dict(passed or {})
+        for name, value, related_model in declarations:
+            if not isinstance(value, transforms.RelationShipProperty) or passed.get(name):
+                continue
+            if isinstance(related_model, transforms.Relationship):
+                related_model = related_model.related_model
+            model = self.client._type_map[related_model.resource_name](self.client)
+            passed[name] = (await getattr(model, value.property_name))["id"]
+        return passed
+
+    def _check_writable(self) -> None:
+        if isinstance(self, models.GetOnlyMixin):
+            raise NotImplementedError(self.__class__.message)
+
+    # blocking APIs of the synchronous models which have no async counterpart yet
+
+    def bulk_post(self, *args, **kwargs) -> None:
+        raise NotImplementedError(SYNC_ONLY_MESSAGE)
+
+    def bulk_patch(self, *args, **kwargs) -> None:
+        raise NotImplementedError(SYNC_ONLY_MESSAGE)
+
+    def bulk_delete(self, *args, **kwargs) -> None:
+        raise NotImplementedError(SYNC_ONLY_MESSAGE)
+
+    def columns(self, *args, **kwargs) -> None:
+        raise NotImplementedError(SYNC_ONLY_MESSAGE)
+
+    def export(self, *args, **kwargs) -> None:
+        raise NotImplementedError(SYNC_ONLY_MESSAGE)
+
+
+class AsyncUsers(AsyncModelMixin, models.Users):
+    @property
+    def me(self):
+        """Return an awaitable of the current logged in user, it is only fetched once."""
+        return self.client.identity.get("me", self._fetch_me)
+
+    def _fetch_me(self):
+        task = asyncio.ensure_future(self.get(id="me"))
+        task.add_done_callback(self._forget_failed_me)
+        return task
+
+    def _forget_failed_me(self, task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None:
+            self.client.identity.invalidate("me")
+
+
+class AsyncWorktimeBalances(AsyncModelMixin, models.WorktimeBalances):
+    async def get(self, *args, **kwargs):
+        overtimes = await super().get(*args, **kwargs)
+        return (
+            overtimes
+            if (kwargs.get("raw") or kwargs.get("include"))
+            else overtimes[0]["attributes"]["balance"]
+        )
+
+
+class AsyncCustomers(AsyncModelMixin, models.Customers):
+    pass
+
+
+class AsyncProjects(AsyncModelMixin, models.Projects):
+    pass
+
+
+class AsyncTasks(AsyncModelMixin, models.Tasks):
+    pass
+
+
+class AsyncActivities(AsyncModelMixin, models.Activities):
+    @property
+    def current(self):
+        """Return an awaitable of the running activity, see :attr:`Activities.current`."""
+        return self._current_activity()
+
+    async def _current_activity(self):
+        if self._current_is_stale():
+            return await self.refresh()
+        return self._current[1]
+
+    async def refresh(self) -> dict:
+        """Fetch the running activity from the API."""
+        self._track(((await self.get({"active": True})) or [{}])[0])
+        return self._current[1]
+
+    async def start(self, **kwargs):
+        await self.stop()
+        return await self.post(**kwargs)
+
+    async def stop(self):
+        if current := await self.current:
+            attributes = {**current["attributes"], "to-time": datetime.now()}
+            return await self.patch(current["id"], attributes, current["relationships"])
+        return None
+
+    async def post(self, *args, **kwargs):
+        resp = await super().post(*args, **kwargs)
+        self._track_response(resp)
+        return resp
+
+    async def patch(self, *args, **kwargs):
+        resp = await super().patch(*args, **kwargs)
+        self._track_response(resp)
+        return resp
+
+    async def delete(self, id):
+        resp = await super().delete(id)
+        self._track_delete(id)
+        return resp
+
+
+class AsyncReports(AsyncModelMixin, models.Reports):
+    pass
+
+
+class AsyncTimedAPIClient:
+    """Asyncio client for the timed API.
+
+    All requests go through a single pooled ``httpx.AsyncClient``, so models can be used
+    concurrently (e.g. with ``asyncio.gather``). A custom ``transport`` can be passed to
+    talk to a local fake server in tests.
+    """
+
+    def __init__(
+        self,
+        token,
+        url,
+        api_namespace,
+        max_connections: int = 10,
+        timeout: float = 30,
+        transport=None,
+        identity_ttl: float | None = None,
+    ):
+        try:
+            import httpx
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "AsyncTimedAPIClient requires httpx, install it with `pip install libtimed[async]`"
+            ) from e
+
+        self.token = token
+        self.url = f"{url}/{api_namespace}/"
+        self.session = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/vnd.api+json",
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+        # resolved identities (e.g. the current user) shared by all models
+        self.identity = IdentityCache(identity_ttl)
+        # Models
+        self.users = AsyncUsers(self)
+        self.reports = AsyncReports(self)
+        self.overtime = AsyncWorktimeBalances(self)
+        self.activities = AsyncActivities(self)
+        self.customers = AsyncCustomers(self)
+        self.tasks = AsyncTasks(self)
+        self.projects = AsyncProjects(self)
+
+        self._type_map = {
+            model.resource_name: model
+            for model in (
+                AsyncUsers,
+                AsyncReports,
+                AsyncWorktimeBalances,
+                AsyncActivities,
+                AsyncCustomers,
+                AsyncTasks,
+                AsyncProjects,
+            )
+        }
+
+    def set_token(self, token) -> None:
+        """Use another access token for all following requests, e.g. a renewed one."""
+        self.token = token
+        self.session.headers["Authorization"] = f"Bearer {token}"
+
+    async def aclose(self) -> None:
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
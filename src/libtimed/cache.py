@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+
+class IdentityCache:
+    """Memoize resolved identities, like the current user, for all models of a client.
+
+    Entries live for ``ttl`` seconds or, if no ttl is set, until they are invalidated.
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        self.ttl = ttl
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value of ``key``, calling ``factory`` to resolve a missing one."""
+        with self._lock:
+            if (entry := self._entries.get(key)) and (
+                self.ttl is None or time.monotonic() - entry[0] < self.ttl
+            ):
+                return entry[1]
+            value = factory()
+            self._entries[key] = (time.monotonic(), value)
+            return value
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop a single entry or, without a key, all of them."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class LRUCache:
+    """Thread safe in-memory LRU cache whose entries expire after a TTL.
+
+    It keeps at most ``maxsize`` entries and counts its hits, stale hits and misses.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        # key -> (monotonic expiry time or None, seconds it may be served stale, value)
+        self._entries: OrderedDict[Hashable, tuple[float | None, float, Any]] = OrderedDict()
+        # keys which are being refreshed in the background
+        self._refreshing: set[Hashable] = set()
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], Any],
+        ttl: float | None = None,
+        stale_ttl: float = 0,
+        refresh: Callable[[], Any] | None = None,
+    ) -> Any:
+        """Return the value of ``key``, calling ``load`` to load a missing one.
+
+        Expired entries are still returned for ``stale_ttl`` seconds after they expired,
+        while ``refresh`` (``load`` by default) reloads them once on a background thread
+        (stale-while-revalidate).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or now < entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not None and now < entry[0] + entry[1]:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self._refresh(key, refresh or load, ttl, entry[1])
+                return entry[2]
+            self.misses += 1
+        value = load()
+        self.set(key, value, ttl, stale_ttl)
+        return value
+
+    def set(
+        self, key: Hashable, value: Any, ttl: float | None = None, stale_ttl: float = 0
+    ) -> None:
+        """Store a value, it expires after the smaller of ``ttl`` and the cache's TTL."""
+        ttl = min((t for t in (ttl, self.ttl) if t is not None), default=None)
+        with self._lock:
+            expires = None if ttl is None else time.monotonic() + ttl
+            self._entries[key] = (expires, stale_ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop all entries whose key matches the predicate."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+        }
+
+    def _refresh(
+        self, key: Hashable, load: Callable[[], Any], ttl: float | None, stale_ttl: float
+    ) -> None:
+        """Reload an entry in the background, unless that is already happening."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="libtimed")
+
+        def refresh():
+            try:
+                self.set(key, load(), ttl, stale_ttl)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(refresh)
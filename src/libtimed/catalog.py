@@ -0,0 +1,164 @@
+import json
+import time
+from bisect import bisect_left, insort
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# resource type -> (client attribute, relationship to the parent, type of the parent)
+CATALOG_TYPES = {
+    "customers": ("customers", None, None),
+    "projects": ("projects", "customer", "customers"),
+    "tasks": ("tasks", "project", "projects"),
+}
+CHILD_TYPES = {parent_type: type for type, (*_, parent_type) in CATALOG_TYPES.items()}
+
+
+class Catalog:
+    """Local, searchable index of all non-archived customers, projects and tasks.
+
+    Entries are small dicts with the ``type``, ``id``, ``name`` and ``parent`` id of a
+    resource. After a :meth:`sync` (or :meth:`load`) all lookups are answered locally.
+    """
+
+    def __init__(self, client, max_age: float = 60 * 60, page_size: int = 500) -> None:
+        self.client = client
+        self.max_age = max_age
+        self.page_size = page_size
+        self.synced_at: float | None = None
+        self._entries: dict[tuple[str, str], dict] = {}
+        self._children: dict[tuple[str, str], set[str]] = {}
+        # sorted (casefolded name, type, id) tuples for prefix search
+        self._names: list[tuple[str, str, str]] = []
+
+    def sync(self, force=False) -> dict[str, int]:
+        """Fetch the catalog and apply the changes to the local index.
+
+        Nothing is fetched if the last sync is younger than ``max_age``, unless ``force`` is
+        set. Only entries which were added, changed or removed are re-indexed, the number of
+        those is returned per type.
+
+        The timed API can't filter by modification time, so every sync downloads the three
+        collections. Only the fields the catalog keeps (the name and the parent) are
+        requested, which keeps them small.
+        """
+        changes = dict.fromkeys(CATALOG_TYPES, 0)
+        if not force and self.synced_at and time.time() - self.synced_at < self.max_age:
+            return changes
+        for resource_type, (model_name, parent_relationship, _) in CATALOG_TYPES.items():
+            model = getattr(self.client, model_name)
+            fields = {resource_type: ["name", *filter(None, [parent_relationship])]}
+            fetched = {
+                item["id"]: self._entry(item, parent_relationship)
+                for item in model.get_all(page_size=self.page_size, cached=False, fields=fields)
+            }
+            for id in [id for type, id in self._entries if type == resource_type]:
+                if id not in fetched:
+                    self._remove(resource_type, id)
+                    changes[resource_type] += 1
+            for entry in fetched.values():
+                if self._entries.get((resource_type, entry["id"])) != entry:
+                    self._add(entry)
+                    changes[resource_type] += 1
+        self.synced_at = time.time()
+        return changes
+
+    def get(self, type: str, id: str | int) -> dict | None:
+        return self._entries.get((type, str(id)))
+
+    def all(self, type: str) -> list[dict]:
+        return [entry for (entry_type, _), entry in self._entries.items() if entry_type == type]
+
+    def parent(self, entry: dict) -> dict | None:
+        if (parent_type := CATALOG_TYPES[entry["type"]][2]) and entry["parent"]:
+            return self.get(parent_type, entry["parent"])
+        return None
+
+    def children(self, entry: dict) -> list[dict]:
+        child_type = CHILD_TYPES.get(entry["type"])
+        return [
+            self._entries[(child_type, id)]
+            for id in self._children.get((entry["type"], entry["id"]), ())
+        ]
+
+    def path(self, entry: dict) -> list[dict]:
+        """Return the entry and its ancestors, starting with the customer."""
+        path = [entry]
+        while parent := self.parent(path[0]):
+            path.insert(0, parent)
+        return path
+
+    def search(
+        self, query: str, type: str | None = None, limit: int = 20, cutoff: float = 0.6
+    ) -> list[dict]:
+        """Search entries by name.
+
+        Names starting with the query come first, followed by fuzzy matches whose similarity
+        to the query is at least ``cutoff``.
+        """
+        query = query.casefold()
+        results = []
+        index = bisect_left(self._names, (query,))
+        while index < len(self._names) and self._names[index][0].startswith(query):
+            if len(results) == limit:
+                return results
+            _, entry_type, id = self._names[index]
+            if type in (None, entry_type):
+                results.append(self._entries[(entry_type, id)])
+            index += 1
+
+        matcher = SequenceMatcher(b=query)
+        fuzzy = []
+        for name, entry_type, id in self._names:
+            if type not in (None, entry_type) or name.startswith(query):
+                continue
+            matcher.set_seq1(name)
+            if (score := 1.0 if query in name else matcher.ratio()) >= cutoff:
+                fuzzy.append((-score, name, entry_type, id))
+        fuzzy.sort()
+        results.extend(self._entries[(entry_type, id)] for *_, entry_type, id in fuzzy)
+        return results[:limit]
+
+    def save(self, path: str | Path) -> None:
+        """Persist the catalog so it can be used offline."""
+        Path(path).write_text(
+            json.dumps({"synced_at": self.synced_at, "entries": list(self._entries.values())})
+        )
+
+    def load(self, path: str | Path) -> None:
+        """Replace the catalog with a previously saved one."""
+        data = json.loads(Path(path).read_text())
+        self._entries.clear()
+        self._children.clear()
+        self._names.clear()
+        for entry in data["entries"]:
+            self._add(entry)
+        self.synced_at = data["synced_at"]
+
+    @staticmethod
+    def _entry(item: dict, parent_relationship: str | None) -> dict:
+        parent = None
+        if parent_relationship:
+            relationship = (item.get("relationships") or {}).get(parent_relationship) or {}
+            # the relationship is replaced by the related resource if that was included
+            parent = (relationship.get("data") or relationship).get("id")
+        return {
+            "type": item["type"],
+            "id": item["id"],
+            "name": item["attributes"].get("name") or "",
+            "parent": parent,
+        }
+
+    def _add(self, entry: dict) -> None:
+        self._remove(entry["type"], entry["id"])
+        self._entries[(entry["type"], entry["id"])] = entry
+        insort(self._names, (entry["name"].casefold(), entry["type"], entry["id"]))
+        if parent_type := CATALOG_TYPES[entry["type"]][2]:
+            self._children.setdefault((parent_type, entry["parent"]), set()).add(entry["id"])
+
+    def _remove(self, type: str, id: str) -> None:
+        if (entry := self._entries.pop((type, id), None)) is None:
+            return
+        name = (entry["name"].casefold(), type, id)
+        del self._names[bisect_left(self._names, name)]
+        if parent_type := CATALOG_TYPES[type][2]:
+            self._children.get((parent_type, entry["parent"]), set()).discard(id)
@@ -0,0 +1,29 @@
+"""Decoding of JSON:API documents.
+
+``orjson`` is used if it is installed, it decodes considerably faster than the standard
+library.
+"""
+
+import functools
+import json
+from collections.abc import Callable
+from typing import Any
+
+from urllib3.util import make_headers
+
+# every content coding urllib3 can decode, brotli requires the optional ``brotli`` package
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+@functools.cache
+def _loads() -> Callable[[bytes | str], Any]:
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover
+        return json.loads
+    return orjson.loads
+
+
+def loads(content: bytes | str) -> Any:
+    """Decode a JSON document."""
+    return _loads()(content)
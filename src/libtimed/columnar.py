@@ -0,0 +1,160 @@
+"""Column oriented exports of reports and activities.
+
+Columns are ``array.array`` buffers of 64 bit integers which can be wrapped by NumPy without
+copying. The vectorized aggregations require the optional ``numpy`` dependency.
+"""
+
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import date
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# 1970-01-05, the first monday after the epoch
+FIRST_MONDAY = 4
+MISSING = -1
+
+REPORT_COLUMNS = ("id", "date", "duration", "user", "task", "project", "customer")
+ACTIVITY_COLUMNS = REPORT_COLUMNS
+# sparse fieldsets with only the fields the columns are built from
+RELATED_FIELDS = {"tasks": ["project"], "projects": ["customer"], "customers": ["name"]}
+REPORT_FIELDS = {"reports": ["date", "duration", "user", "task"], **RELATED_FIELDS}
+ACTIVITY_FIELDS = {"activities": ["date", "from-time", "to-time", "user", "task"], **RELATED_FIELDS}
+# columns holding days since the epoch
+DATE_COLUMNS = frozenset({"date"})
+BUCKETS = ("day", "week", "month", "year")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "Vectorized aggregations require numpy, install it with `pip install libtimed[numpy]`"
+        ) from e
+    return numpy
+
+
+def _id(value) -> int:
+    """Return the id of a resource or of the resource a relationship points to."""
+    if not value:
+        return MISSING
+    id = value.get("id") or (value.get("data") or {}).get("id")
+    return int(id) if id is not None else MISSING
+
+
+def _related(item: Mapping, *path: str) -> Mapping | None:
+    """Follow a path of included relationships, e.g. ``("task", "project")``."""
+    for name in path:
+        item = ((item or {}).get("relationships") or {}).get(name)
+    return item
+
+
+class Columns:
+    """Column oriented collection of resources.
+
+    Ids are ``-1`` where the related resource is unknown (e.g. not included), dates are days
+    since the epoch and durations are seconds.
+    """
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.columns = {name: array("q") for name in names}
+
+    def __getitem__(self, name: str) -> array:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def append(self, row: Sequence[int]) -> None:
+        for column, value in zip(self.columns.values(), row, strict=True):
+            column.append(value)
+
+    def numpy(self, name: str):
+        """Return a column as NumPy array sharing the buffer, dates as ``datetime64[D]``."""
+        numpy = _numpy()
+        column = numpy.frombuffer(self.columns[name], dtype=numpy.int64)
+        return column.view("datetime64[D]") if name in DATE_COLUMNS else column
+
+    def bucket(self, name: str, bucket: str):
+        """Truncate a date column to the start of its day, (ISO) week, month or year."""
+        numpy = _numpy()
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket {bucket}, options are {', '.join(BUCKETS)}")
+        dates = self.numpy(name)
+        if bucket == "week":
+            days = dates.view(numpy.int64)
+            return ((days - FIRST_MONDAY) // 7 * 7 + FIRST_MONDAY).view("datetime64[D]")
+        if bucket == "day":
+            return dates
+        return dates.astype(f"datetime64[{bucket[0].upper()}]").astype("datetime64[D]")
+
+    def group_sum(
+        self,
+        by: str | Sequence[str],
+        value: str = "duration",
+        bucket: str | None = None,
+    ) -> dict:
+        """Sum a column grouped by one or more key columns.
+
+        If a ``bucket`` is given, date key columns are truncated to it (see :meth:`bucket`).
+        The result maps the key columns and the value column to arrays with one entry per
+        group, ordered by the keys.
+        """
+        numpy = _numpy()
+        by = (by,) if isinstance(by, str) else tuple(by)
+        keys = [
+            self.bucket(name, bucket) if bucket and name in DATE_COLUMNS else self.numpy(name)
+            for name in by
+        ]
+        groups, inverse = numpy.unique(
+            numpy.stack([key.view(numpy.int64) for key in keys]), axis=1, return_inverse=True
+        )
+        totals = numpy.zeros(groups.shape[1], dtype=numpy.int64)
+        numpy.add.at(totals, inverse.reshape(-1), self.numpy(value))
+        return {
+            name: group.astype(key.dtype) for name, group, key in zip(by, groups, keys, strict=True)
+        } | {value: totals}
+
+
+def report_columns(reports: Iterable[Mapping]) -> Columns:
+    """Build the columns of deserialized reports.
+
+    Project and customer ids are only known if they were included, e.g. with
+    ``include="task,task.project,task.project.customer"``.
+    """
+    columns = Columns(REPORT_COLUMNS)
+    for report in reports:
+        attributes = report["attributes"]
+        duration = attributes.get("duration")
+        columns.append(
+            (
+                int(report["id"]),
+                attributes["date"].toordinal() - EPOCH_ORDINAL,
+                int(duration.total_seconds()) if duration else 0,
+                _id(_related(report, "user")),
+                _id(_related(report, "task")),
+                _id(_related(report, "task", "project")),
+                _id(_related(report, "task", "project", "customer")),
+            )
+        )
+    return columns
+
+
+def activity_columns(activities: Iterable[Mapping]) -> Columns:
+    """Build the columns of deserialized activities, running activities have no duration."""
+    columns = Columns(ACTIVITY_COLUMNS)
+    for activity in activities:
+        attributes = activity["attributes"]
+        from_time, to_time = attributes.get("from-time"), attributes.get("to-time")
+        columns.append(
+            (
+                int(activity["id"]),
+                attributes["date"].toordinal() - EPOCH_ORDINAL,
+                int((to_time - from_time).total_seconds()) if from_time and to_time else 0,
+                _id(_related(activity, "user")),
+                _id(_related(activity, "task")),
+                _id(_related(activity, "task", "project")),
+                _id(_related(activity, "task", "project", "customer")),
+            )
+        )
+    return columns
@@ -0,0 +1,114 @@
+"""Streaming exports of collections to CSV or newline delimited JSON."""
+
+import csv
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+FORMATS = ("csv", "ndjson")
+
+
+@contextmanager
+def _open(path_or_fileobj: str | Path | IO[str]) -> Iterator[IO[str]]:
+    if isinstance(path_or_fileobj, str | Path):
+        with Path(path_or_fileobj).open("w", newline="") as file:
+            yield file
+    else:
+        yield path_or_fileobj
+
+
+def _related_model(model: type, path: str) -> type | None:
+    """Return the model at the end of an include path like ``task.project``."""
+    for name in path.split("."):
+        if (model := model.schema.related_models.get(name)) is None:
+            return None
+    return model
+
+
+def _follow(item: dict | None, path: str) -> dict | None:
+    for name in path.split("."):
+        item = ((item or {}).get("relationships") or {}).get(name)
+    return item
+
+
+def _id(value: dict | None) -> str | None:
+    if not value:
+        return None
+    return value.get("id") or (value.get("data") or {}).get("id")
+
+
+class Flattener:
+    """Flatten deserialized resources of a model into rows.
+
+    Rows hold the id, the serialized attributes and the id of every relationship. For every
+    include path, the id and the name (if the included model has one) of the included
+    resource are added, e.g. ``task.project`` and ``task.project.name``.
+    """
+
+    def __init__(self, model: type, include: str | None = None) -> None:
+        self.attributes = model.schema.attributes
+        self.relationships = [name for name, *_ in model.schema.relationships]
+        self.paths = [path for path in (include or "").split(",") if path]
+        # relationships and include paths whose ids are exported
+        self.id_paths = list(dict.fromkeys([*self.relationships, *self.paths]))
+        self.named_paths = [
+            path
+            for path in self.paths
+            if (related_model := _related_model(model, path))
+            and "name" in related_model.schema.attribute_transforms
+        ]
+
+    @property
+    def fieldnames(self) -> list[str]:
+        return [
+            "id",
+            *(name for name, *_ in self.attributes),
+            *self.id_paths,
+            *(f"{path}.name" for path in self.named_paths),
+        ]
+
+    def row(self, item: dict) -> dict:
+        attributes = item["attributes"]
+        row = {"id": item["id"]}
+        for name, _, transform in self.attributes:
+            value = attributes.get(name)
+            row[name] = None if value is None else transform.serialize(value)
+        for path in self.id_paths:
+            row[path] = _id(_follow(item, path))
+        for path in self.named_paths:
+            row[f"{path}.name"] = ((_follow(item, path) or {}).get("attributes") or {}).get("name")
+        return row
+
+
+def export(
+    model,
+    path_or_fileobj: str | Path | IO[str],
+    format: str = "csv",
+    filters=None,
+    include: str | None = None,
+    page_size: int = 100,
+) -> int:
+    """Write all resources of a model to a file, one page at a time.
+
+    Returns the number of written rows.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format}, options are {', '.join(FORMATS)}")
+    flattener = Flattener(model.__class__, include)
+    count = 0
+    with _open(path_or_fileobj) as file:
+        if format == "csv":
+            writer = csv.DictWriter(file, fieldnames=flattener.fieldnames)
+            writer.writeheader()
+            write = writer.writerow
+        else:
+
+            def write(row):
+                file.write(json.dumps(row) + "\n")
+
+        for item in model.iter(filters, include, page_size):
+            write(flattener.row(item))
+            count += 1
+    return count
@@ -0,0 +1,193 @@
+"""Timing events of model operations and their aggregated statistics.
+
+Every callable in the ``hooks`` of a :class:`~libtimed.TimedAPIClient` is called with an
+:class:`Event` once a model operation (``get``, ``get_all``, ``post``, ...) finished. Without
+hooks no events are created, so instrumentation costs next to nothing unless it is used.
+
+.. code-block:: python
+
+    stats = Stats()
+    client = TimedAPIClient(token, url, api_namespace, hooks=[stats])
+    client.reports.get_all()
+    stats.snapshot()["reports.get_all"]["phases"]["network"]
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from contextlib import nullcontext
+from typing import Any
+
+# where the time of an operation goes, the rest is spent in the library itself
+PHASES = ("network", "cache", "decode", "deserialize")
+# upper bounds in seconds of the latency histogram buckets, the last bucket is unbounded
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# used in place of an event if there are no hooks
+NO_EVENT = nullcontext()
+
+
+class Event:
+    """Timing and counters of a single model operation.
+
+    ``phases`` holds the seconds spent per phase, see ``PHASES``.
+    """
+
+    __slots__ = (
+        "model",
+        "operation",
+        "url",
+        "status",
+        "duration",
+        "phases",
+        "requests",
+        "bytes",
+        "cache_hits",
+        "cache_misses",
+        "retries",
+        "error",
+        "_hooks",
+        "_start",
+        "_lock",
+    )
+
+    def __init__(self, hooks: tuple[Callable, ...], model: str, operation: str, url: str):
+        self.model = model
+        self.operation = operation
+        self.url = url
+        self.status: int | None = None
+        self.duration = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.requests = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retries = 0
+        self.error: Exception | None = None
+        self._hooks = hooks
+        self._start = time.perf_counter()
+        # pages of get_all may be fetched by several threads
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Event":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        # closing a generator (GeneratorExit) is no error
+        self.finish(exc if isinstance(exc, Exception) else None)
+
+    def __repr__(self) -> str:
+        return (
+            f"<Event {self.model}.{self.operation} status={self.status}"
+            f" duration={self.duration:.6f}>"
+        )
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] += seconds
+
+    def count(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def response(self, resp, seconds: float, streamed=False) -> None:
+        """Account for a response which took ``seconds`` to arrive."""
+        # only responses of the cached session know whether they came from the cache
+        from_cache = getattr(resp, "from_cache", None)
+        retries = getattr(getattr(resp.raw, "retries", None), "history", ())
+        with self._lock:
+            self.phases["cache" if from_cache else "network"] += seconds
+            self.requests += 1
+            self.cache_hits += from_cache is True
+            self.cache_misses += from_cache is False
+            self.retries += len(retries)
+            self.bytes += 0 if streamed else len(resp.content)
+            self.status = max(self.status or 0, resp.status_code)
+
+    def memory_hit(self, seconds: float) -> None:
+        """Account for a document served by the memory cache of the client."""
+        with self._lock:
+            self.phases["cache"] += seconds
+            self.cache_hits += 1
+
+    def finish(self, error: Exception | None = None) -> None:
+        self.duration = time.perf_counter() - self._start
+        self.error = error
+        for hook in self._hooks:
+            hook(self)
+
+
+def send(event: Event | None, request: Callable, *args, **kwargs):
+    """Send a request with ``request`` (e.g. ``session.get``), accounting for it in ``event``."""
+    if event is None:
+        return request(*args, **kwargs)
+    start = time.perf_counter()
+    resp = request(*args, **kwargs)
+    event.response(resp, time.perf_counter() - start, kwargs.get("stream", False))
+    return resp
+
+
+def timed(event: Event | None, phase: str, func: Callable, *args) -> Any:
+    """Call ``func`` and add the time it took to a phase of ``event``."""
+    if event is None:
+        return func(*args)
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        event.add(phase, time.perf_counter() - start)
+
+
+class Stats:
+    """Thread safe aggregate of the events of a client per model and operation, register it as a hook."""
+
+    def __init__(self, buckets: tuple[float, ...] = HISTOGRAM_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        key = f"{event.model}.{event.operation}"
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                entry = self._entries[key] = self._entry()
+            entry["count"] += 1
+            entry["errors"] += event.error is not None
+            entry["duration"] += event.duration
+            for phase, seconds in event.phases.items():
+                entry["phases"][phase] += seconds
+            for name in ("requests", "bytes", "cache_hits", "cache_misses", "retries"):
+                entry[name] += getattr(event, name)
+            entry["histogram"][bisect_left(self.buckets, event.duration)] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return a copy of the statistics, e.g. to export them to a metrics system."""
+        bounds = (*self.buckets, float("inf"))
+        with self._lock:
+            return {
+                key: {
+                    **entry,
+                    "phases": dict(entry["phases"]),
+                    "histogram": dict(zip(bounds, entry["histogram"], strict=True)),
+                }
+                for key, entry in self._entries.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _entry(self) -> dict:
+        return {
+            "count": 0,
+            "errors": 0,
+            "duration": 0.0,
+            "phases": dict.fromkeys(PHASES, 0.0),
+            "requests": 0,
+            "bytes": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "retries": 0,
+            "histogram": [0] * (len(self.buckets) + 1),
+        }
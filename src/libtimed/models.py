@@ -1,14 +1,19 @@
 import functools
+import re
+import time
+from collections.abc import Iterable, Iterator, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from enum import Enum
 
-from inflection import underscore
-from requests import Response
+from requests import RequestException, Response
 
-from libtimed import transforms
+from libtimed import codec, columnar, export, records, transforms
+from libtimed.instrumentation import NO_EVENT, Event, send, timed
 
 ARCHIVED = ("archived", False, transforms.Type(bool, pipe=int))
-DATE = ("date", date.today(), transforms.Date)
+# callable defaults (like date.today) are called every time the default is used
+DATE = ("date", date.today, transforms.Date)
 FROM_DATE = ("from_date", None, transforms.Date)
 TO_DATE = ("to_date", None, transforms.Date)
 DURATION = ("duration", timedelta(minutes=15), transforms.Duration)
@@ -17,6 +22,12 @@ REVIEW = ("review", False, transforms.Type(bool, False))
 NOT_BILLABLE = ("not-billable", False, transforms.Type(bool, False))
 NAME = ("name", None, transforms.Type(str))
 
+# responses telling that the request was not processed, so even POST requests can be retried
+POST_RETRY_STATUS_CODES = frozenset({429, 503})
+
+# seconds responses of models without a cache policy are cached for when explicitly requested
+DEFAULT_CACHE_EXPIRE_AFTER = 60 * 60 * 24
+
 
 class UserOrdering(Enum):
     EMAIL = "email"
@@ -25,6 +36,15 @@ class UserOrdering(Enum):
     USERNAME = "username"
 
 
+def resource_name_of(class_name: str) -> str:
+    """Return the resource name of a model class name, e.g. ``worktime-balances``."""
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "-", class_name).lower()
+
+
+def _default(value):
+    return value() if callable(value) else value
+
+
 class GetOnlyMixin:
     message = "This model is get-only!"
 
@@ -34,6 +54,175 @@ class GetOnlyMixin:
     def patch(self, *args, **kwargs) -> None:
         raise NotImplementedError(self.__class__.message)
 
+    def bulk_post(self, *args, **kwargs) -> None:
+        raise NotImplementedError(self.__class__.message)
+
+    def bulk_patch(self, *args, **kwargs) -> None:
+        raise NotImplementedError(self.__class__.message)
+
+
+class LazyAttributes(MutableMapping):
+    """Attributes of a resource which are only deserialized once they are accessed.
+
+    Every value is deserialized on its first access and memoized.
+    """
+
+    __slots__ = ("_raw", "_transforms", "_values")
+
+    def __init__(self, raw: dict, attribute_transforms: dict[str, transforms.BaseTransform]):
+        self._raw = raw
+        self._transforms = attribute_transforms
+        self._values = {}
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        value = self._raw[key]
+        if transform := self._transforms.get(key):
+            value = transform.deserialize(value)
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._raw.setdefault(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        del self._raw[key]
+        self._values.pop(key, None)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+class IdentityMap:
+    """Index of the included resources of a response, each is deserialized at most once and shared.
+
+    Records of related resources are kept in ``related`` if it is given.
+    """
+
+    def __init__(
+        self,
+        client,
+        included: list[dict] | None = None,
+        lazy=False,
+        related: "IdentityMap | None" = None,
+    ) -> None:
+        self.client = client
+        # keep the raw attribute values and only deserialize them on access
+        self.lazy = lazy
+        self.related = related or self
+        self._raw: dict[tuple[str, str], dict] = {}
+        self._resolved: dict[tuple[str, str], dict] = {}
+        self._models: dict[str, BaseModel] = {}
+        self._records: dict[tuple[str, str], records.Record] = {}
+        self.add(included or [])
+
+    def add(self, included: list[dict]) -> None:
+        """Add included resources to the index, they are only deserialized once requested."""
+        for included_item in included:
+            self._raw.setdefault(
+                (included_item.get("type"), included_item.get("id")), included_item
+            )
+
+    def resolve(self, item_type: str, item_id: str) -> dict | None:
+        """Return the deserialized included resource or None if it wasn't included."""
+        key = (item_type, item_id)
+        if (resolved := self._resolved.get(key)) is not None:
+            return resolved
+        if (included_item := self._raw.get(key)) is None:
+            return None
+        # register before deserializing so cyclic relationships resolve to the same object
+        self._resolved[key] = included_item
+        if (model := self._models.get(item_type)) is None:
+            model = self._models[item_type] = self.client._type_map[item_type](self.client)
+        return model._deserialize(included_item, self)
+
+    def record(self, item: dict) -> records.Record:
+        """Return the typed record of a deserialized resource, it is only created once."""
+        key = (item["type"], item["id"])
+        if (record := self._records.get(key)) is not None:
+            return record
+        if model := self.client._type_map.get(item["type"]):
+            record_class = model.record_class()
+        else:
+            record_class = records.record_class(item["type"], (), ())
+        # register before filling the relationships so cyclic relationships resolve
+        record = self._records[key] = record_class()
+        record.id = item["id"]
+        if "attributes" not in item:
+            # stub of a related resource which wasn't included
+            return record
+        attributes = item["attributes"]
+        for name, field in record_class._attribute_fields:
+            setattr(record, field, attributes.get(name))
+        relationships = item.get("relationships") or {}
+        for name, field in record_class._relationship_fields:
+            setattr(record, field, self._related_record(relationships.get(name)))
+        return record
+
+    def _related_record(self, value: dict | list | None):
+        if isinstance(value, list):
+            return [self._related_record(related) for related in value]
+        if not value:
+            return None
+        record = self.related.record
+        if "type" in value:
+            # the relationship was replaced by the included resource
+            return record(value)
+        if isinstance(data := value.get("data"), list):
+            return [record(related) for related in data]
+        return data and record(data)
+
+
+class Schema:
+    """The declarations of a model, compiled once when the model class is created."""
+
+    def __init__(self, model: type["BaseModel"]) -> None:
+        # (name, default, transform) in declaration order
+        self.attributes = tuple(model.attributes)
+        self.filters = tuple(model.filters)
+        self.relationships = tuple(
+            (name, default, transforms.Relationship(related_model))
+            for name, default, related_model in model.relationships
+        )
+        self.resource_name = model.resource_name
+        # attribute name -> transform, to dispatch deserialization
+        self.attribute_transforms = {name: transform for name, _, transform in self.attributes}
+        # relationship name -> related model, to plan include paths and sparse fieldsets
+        self.related_models = {
+            name: transform.related_model for name, _, transform in self.relationships
+        }
+
+    @functools.cached_property
+    def record_class(self) -> type[records.Record]:
+        # only generated once typed results are requested
+        return records.record_class(
+            self.resource_name,
+            tuple(self.attribute_transforms),
+            tuple(self.related_models),
+        )
+
+
+# resource name -> model
+registry: dict[str, type["BaseModel"]] = {}
+
+
+def _fieldset(resource_name: str, names: Iterable[str]) -> list[str]:
+    if (model := registry.get(resource_name)) is None:
+        raise ValueError(f"Unknown resource type {resource_name}")
+    names = list(dict.fromkeys([names] if isinstance(names, str) else names))
+    declared = model.schema.attribute_transforms.keys() | model.schema.related_models.keys()
+    if unknown := [name for name in names if name not in declared]:
+        raise ValueError(f"Unknown fields of {resource_name}: {', '.join(unknown)}")
+    return names
+
 
 class BaseModel:
     def __init__(self, client) -> None:
@@ -42,61 +231,64 @@ class BaseModel:
     attributes: list[tuple]
     relationships: list[tuple]
     filters: list[tuple]
+    schema: Schema
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.schema = Schema(cls)
+        # variants of a model (e.g. the async ones) don't replace it
+        registry.setdefault(cls.resource_name, cls)
+
+    # seconds cached responses are valid for, models with 0 are not cached by default
+    cache_expire_after: int = 0
+    # resource names whose cached responses are outdated by writes to this model
+    cache_invalidates: tuple[str, ...] = ()
+    # seconds after expiry during which cached responses are still returned while they are
+    # refreshed in the background, 0 disables stale-while-revalidate
+    cache_stale_while_revalidate: int = 0
+
+    def _deserialize(self, item, included):
+        if not isinstance(included, IdentityMap):
+            included = IdentityMap(self.client, included)
+        self._deserialize_attributes([item], included.lazy)
+        self._resolve_relationships(item, included)
+        return item
 
-    def _deserialize(self, item, included):  # noqa: C901
-        for key, value in item["attributes"].items():
-            transform = next(
-                (transform for name, _, transform in self.__class__.attributes if name == key),
-                None,
-            )
-            item["attributes"][key] = (transform).deserialize(value) if transform else value
+    def _deserialize_many(self, items: list[dict], included: "IdentityMap") -> list[dict]:
+        """Deserialize a whole page at once, every attribute is decoded in a single batch."""
+        self._deserialize_attributes(items, included.lazy)
+        for item in items:
+            self._resolve_relationships(item, included)
+        return items
+
+    def _deserialize_attributes(self, items: list[dict], lazy=False) -> None:
+        attribute_transforms = self.schema.attribute_transforms
+        if lazy:
+            for item in items:
+                item["attributes"] = LazyAttributes(item["attributes"], attribute_transforms)
+            return
+        for name, transform in attribute_transforms.items():
+            owners = [item["attributes"] for item in items if name in item["attributes"]]
+            values = transform.deserialize_many([attributes[name] for attributes in owners])
+            for attributes, value in zip(owners, values, strict=True):
+                attributes[name] = value
+
+    def _resolve_relationships(self, item: dict, included: "IdentityMap") -> None:
         relationships = item.get("relationships")
         if not relationships:
-            return item
+            return
         for key, value in relationships.items():
             if not value:
                 continue
-            if value.get("data"):
-                data = value["data"]
+            if data := value.get("data"):
                 if isinstance(data, list):
-                    included_items = []
-                    for rel_data in data:
-                        item_type = rel_data["type"]
-                        item_id = rel_data["id"]
-                        included_item = next(
-                            (
-                                included_item
-                                for included_item in included
-                                if included_item.get("type") == item_type
-                                and included_item.get("id") == item_id
-                            ),
-                            None,
-                        )
-                        if included_item:
-                            included_model = self.client._type_map[item_type](self.client)
-                            included_items.append(
-                                included_model._deserialize(included_item, included)
-                            )
-                    item["relationships"][key] = included_items
-                else:
-                    item_type = data["type"]
-                    item_id = data["id"]
-                    included_item = next(
-                        (
-                            included_item
-                            for included_item in included
-                            if included_item.get("type") == item_type
-                            and included_item.get("id") == item_id
-                        ),
-                        None,
-                    )
-                    if included_item:
-                        included_model = self.client._type_map[item_type](self.client)
-                        item["relationships"][key] = included_model._deserialize(
-                            included_item, included
-                        )
-
-        return item
+                    item["relationships"][key] = [
+                        included_item
+                        for rel_data in data
+                        if (included_item := included.resolve(rel_data["type"], rel_data["id"]))
+                    ]
+                elif included_item := included.resolve(data["type"], data["id"]):
+                    item["relationships"][key] = included_item
 
     def get(
         self,
@@ -104,42 +296,367 @@ class BaseModel:
         include: str | None = None,
         id: str | int | None = None,
         raw=False,
-        cached=False,
+        cached: bool | None = None,
+        typed=False,
+        lazy=False,
+        fields: dict[str, Iterable[str]] | None = None,
     ) -> dict:
-        url = f"{self.url}/{id}" if id else self.url
-        if id:
-            params = {"include": include}
+        """Fetch and deserialize a collection or, if an id is given, a single resource.
+
+        Results served by the memory cache are shared between callers and must not be mutated.
+        """
+        url, params = self._get_request(filters, include, id, fields)
+        with self._event("get", url) as event:
+            resp = self._get_document(url, params, id, cached, lazy, event)
+        if raw:
+            return resp
+        return self._to_records(resp.get("data")) if typed else resp.get("data")
+
+    def iter(
+        self,
+        filters=None,
+        include: str | None = None,
+        page_size: int = 100,
+        cached: bool | None = None,
+        typed=False,
+        lazy=False,
+        fields: dict[str, Iterable[str]] | None = None,
+    ) -> Iterator[dict | records.Record]:
+        """Lazily iterate over all resources, fetching and deserializing one page at a time."""
+        related_records = IdentityMap(self.client)
+        params = self._page_params(filters, include, page_size, fields)
+        with self._event("iter") as event:
+            for page in self._pages(params, cached, event):
+                data = timed(
+                    event,
+                    "deserialize",
+                    self._deserialize_data,
+                    page.get("data") or [],
+                    page.get("included", []),
+                    lazy,
+                )
+                if typed:
+                    data = map(IdentityMap(self.client, related=related_records).record, data)
+                yield from data
+
+    def get_all(
+        self,
+        filters=None,
+        include: str | None = None,
+        page_size: int = 100,
+        max_workers: int | None = None,
+        cached: bool | None = None,
+        typed=False,
+        lazy=False,
+        fields: dict[str, Iterable[str]] | None = None,
+    ) -> list[dict | records.Record]:
+        """Fetch every page and return all resources in order.
+
+        The pages after the first one are fetched concurrently on ``max_workers`` threads.
+        """
+        params = self._page_params(filters, include, page_size, fields)
+        with self._event("get_all") as event:
+            pages = self._pages(params, cached, event)
+            first_page = next(pages)
+            page_count = ((first_page.get("meta") or {}).get("pagination") or {}).get("pages", 1)
+            if max_workers and page_count > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    pages = executor.map(
+                        lambda number: self._fetch(
+                            self.url, {**params, "page[number]": number}, cached, event=event
+                        ),
+                        range(2, page_count + 1),
+                    )
+                    pages = [first_page, *pages]
+            else:
+                pages = [first_page, *pages]
+
+            identity_map = IdentityMap(self.client, lazy=lazy)
+            data = timed(event, "deserialize", self._deserialize_pages, pages, identity_map)
+        return list(map(identity_map.record, data)) if typed else data
+
+    def export(
+        self,
+        path_or_fileobj,
+        format: str = "csv",
+        filters=None,
+        include: str | None = None,
+        page_size: int = 100,
+    ) -> int:
+        """Stream all resources to a CSV or NDJSON file, see :func:`libtimed.export.export`."""
+        return export.export(self, path_or_fileobj, format, filters, include, page_size)
+
+    def _get_document(
+        self,
+        url: str,
+        params: dict,
+        id: str | int | None,
+        cached: bool | None,
+        lazy=False,
+        event: Event | None = None,
+    ) -> dict:
+        """Fetch and deserialize a document, going through the memory cache if there is one."""
+        memory_cache = self.client.memory_cache
+        expire_after = self._cache_expire_after(cached)
+
+        def load(stale=True, event=event):
+            resp = self._fetch(url, params, cached, stale, event)
+            return timed(event, "deserialize", self._parse_get_response, resp, id, True, lazy)
+
+        if not expire_after or memory_cache is None:
+            return load()
+        start = time.perf_counter()
+        document = memory_cache.get_or_load(
+            (self.resource_name, url, tuple(sorted(params.items())), lazy),
+            load,
+            expire_after,
+            self.__class__.cache_stale_while_revalidate,
+            # a stale entry of the memory cache shouldn't be refreshed with a stale response,
+            # the refresh happens in the background, after the event was emitted
+            refresh=lambda: load(stale=False, event=None),
+        )
+        if event is not None and not event.requests:
+            event.memory_hit(time.perf_counter() - start)
+        return document
+
+    def _page_params(
+        self,
+        filters,
+        include: str | None,
+        page_size: int,
+        fields: dict[str, Iterable[str]] | None = None,
+    ) -> dict:
+        return {
+            **self._parse_filters(filters),
+            **self._parse_fields(fields, include),
+            "include": include,
+            "page[number]": 1,
+            "page[size]": page_size,
+        }
+
+    def _pages(
+        self, params: dict, cached: bool | None = None, event: Event | None = None
+    ) -> Iterator[dict]:
+        url = self.url
+        while url:
+            page = self._fetch(url, params, cached, event=event)
+            yield page
+            # the next link already contains all query parameters
+            url, params = (page.get("links") or {}).get("next"), None
+
+    def _fetch(
+        self,
+        url: str,
+        params: dict | None,
+        cached: bool | None = None,
+        stale=True,
+        event: Event | None = None,
+    ) -> dict:
+        """Fetch a document, by default cached according to the model's cache policy."""
+        if expire_after := self._cache_expire_after(cached):
+            headers = {}
+            if stale and (stale_while_revalidate := self.__class__.cache_stale_while_revalidate):
+                headers["Cache-Control"] = f"stale-while-revalidate={stale_while_revalidate}"
+            resp = send(
+                event,
+                self.client.cached_session.get,
+                url,
+                params=params,
+                expire_after=expire_after,
+                headers=headers,
+            )
+            if not resp.from_cache:
+                self.client.cache_index(self.resource_name)[resp.cache_key] = resp.url
         else:
-            params = {**self._parse_filters(filters), "include": include}
+            resp = send(event, self.client.session.get, url, params=params)
+        return timed(event, "decode", codec.loads, resp.content)
 
-        session = self.client.cached_session if cached else self.client.session
-        resp = session.get(url, params=params)
-        resp = resp.json()
+    def _cache_expire_after(self, cached: bool | None) -> int:
+        """Return for how many seconds responses are cached, 0 if they aren't."""
+        if cached is False:
+            return 0
+        return self.__class__.cache_expire_after or (DEFAULT_CACHE_EXPIRE_AFTER if cached else 0)
+
+    def _get_request(
+        self,
+        filters,
+        include: str | None,
+        id: str | int | None,
+        fields: dict[str, Iterable[str]] | None = None,
+    ) -> tuple[str, dict]:
+        fieldsets = self._parse_fields(fields, include)
+        if id:
+            return f"{self.url}/{id}", {**fieldsets, "include": include}
+        return self.url, {**self._parse_filters(filters), **fieldsets, "include": include}
 
+    def _parse_get_response(self, resp: dict, id: str | int | None, raw=False, lazy=False) -> dict:
         # de-serialize
         if data := ([resp.get("data")] if id else resp.get("data")):
-            for item in data:
-                item = self._deserialize(item, resp.get("included", []))
+            self._deserialize_data(data, resp.get("included", []), lazy)
         return resp if raw else resp.get("data")
 
+    def _to_records(self, data: list[dict] | dict | None) -> list[records.Record] | records.Record:
+        identity_map = IdentityMap(self.client)
+        if isinstance(data, list):
+            return list(map(identity_map.record, data))
+        return data and identity_map.record(data)
+
+    def _deserialize_data(self, data: list[dict], included: list[dict], lazy=False) -> list[dict]:
+        return self._deserialize_many(data, IdentityMap(self.client, included, lazy))
+
+    def _deserialize_pages(self, pages: list[dict], identity_map: "IdentityMap") -> list[dict]:
+        """Deserialize the resources of all pages, sharing their included resources."""
+        for page in pages:
+            identity_map.add(page.get("included", []))
+        return self._deserialize_many(
+            [item for page in pages for item in page.get("data") or []], identity_map
+        )
+
     def post(self, attributes: dict | None = None, relationships: dict | None = None) -> Response:
         json = self._parse_post_json(attributes, relationships)
-        return self.client.session.post(self.url, json=json)
+        with self._event("post") as event:
+            resp = send(event, self.client.session.post, self.url, json=json)
+        self._invalidate_cache()
+        return resp
 
     def patch(
         self, id, attributes: dict | None = None, relationships: dict | None = None
     ) -> Response:
-        json = self._parse_post_json(attributes, relationships)
-        json["data"]["id"] = id
-        return self.client.session.patch(f"{self.url}/{id}", json=json)
+        json = self._parse_patch_json(id, attributes, relationships)
+        url = f"{self.url}/{id}"
+        with self._event("patch", url) as event:
+            resp = send(event, self.client.session.patch, url, json=json)
+        self._invalidate_cache()
+        return resp
 
     def delete(self, id) -> Response:
-        return self.client.session.delete(f"{self.url}/{id}")
+        url = f"{self.url}/{id}"
+        with self._event("delete", url) as event:
+            resp = send(event, self.client.session.delete, url)
+        self._invalidate_cache()
+        return resp
+
+    def bulk_post(
+        self,
+        items: Iterable[tuple[dict | None, dict | None]],
+        max_workers: int = 4,
+        retries: int = 3,
+    ) -> list[Response | RequestException | transforms.SerializationError]:
+        """Create many resources from ``(attributes, relationships)`` tuples on ``max_workers`` threads.
+
+        Returns the response, or the exception of a failed item, of every item in input order.
+        """
+        return self._bulk_send(
+            [("POST", self.url, json) for json in self._parse_bulk_json(items)],
+            max_workers,
+            "bulk_post",
+            retries,
+        )
+
+    def bulk_patch(
+        self, items: Iterable[tuple[str | int, dict | None, dict | None]], max_workers: int = 4
+    ) -> list[Response | RequestException | transforms.SerializationError]:
+        """Update many resources from ``(id, attributes, relationships)`` tuples, see :meth:`bulk_post`."""
+        items = list(items)
+        jsons = self._parse_bulk_json(
+            (attributes, relationships) for _, attributes, relationships in items
+        )
+        requests = []
+        for (id, *_), json in zip(items, jsons, strict=True):
+            if not isinstance(json, Exception):
+                json["data"]["id"] = id
+            requests.append(("PATCH", f"{self.url}/{id}", json))
+        return self._bulk_send(requests, max_workers, "bulk_patch")
+
+    def bulk_delete(
+        self, ids: Iterable[str | int], max_workers: int = 4
+    ) -> list[Response | RequestException]:
+        """Delete many resources by id, see :meth:`bulk_post`."""
+        return self._bulk_send(
+            [("DELETE", f"{self.url}/{id}", None) for id in ids], max_workers, "bulk_delete"
+        )
+
+    def _bulk_send(
+        self,
+        requests: list[tuple[str, str, dict | transforms.SerializationError | None]],
+        max_workers: int,
+        operation: str,
+        retries: int = 0,
+    ) -> list[Response | RequestException | transforms.SerializationError]:
+        def send_request(request, event):
+            method, url, json = request
+            if isinstance(json, Exception):
+                return json
+            try:
+                resp = send(event, self.client.session.request, method, url, json=json)
+                for attempt in range(retries):
+                    if resp.status_code not in POST_RETRY_STATUS_CODES:
+                        break
+                    if event is not None:
+                        event.count(retries=1)
+                    time.sleep(self._retry_delay(resp, attempt))
+                    resp = send(event, self.client.session.request, method, url, json=json)
+            except RequestException as e:
+                return e
+            return resp
+
+        with (
+            self._event(operation) as event,
+            ThreadPoolExecutor(max_workers=max_workers) as executor,
+        ):
+            results = list(executor.map(lambda request: send_request(request, event), requests))
+        self._invalidate_cache()
+        return results
+
+    def _retry_delay(self, resp: Response, attempt: int) -> float:
+        """Return the seconds to wait before sending a request again, see :class:`Transport`."""
+        retry = self.client.transport.retry
+        retry_after = resp.headers.get("Retry-After", "")
+        delay = int(retry_after) if retry_after.isdigit() else retry.backoff_factor * 2**attempt
+        return min(delay, retry.backoff_max)
+
+    def _invalidate_cache(self) -> None:
+        """Evict the cached responses of this model and the ones depending on it."""
+        resource_names = {self.resource_name, *self.__class__.cache_invalidates}
+        if self.client.memory_cache is not None:
+            self.client.memory_cache.evict(lambda key: key[0] in resource_names)
+        if not self.client.response_cache_exists():
+            return
+        for resource_name in resource_names:
+            index = self.client.cache_index(resource_name)
+            if keys := list(index):
+                self.client.cached_session.cache.delete(*keys, vacuum=False)
+                index.bulk_delete(keys)
+
+    def _event(self, operation: str, url: str | None = None):
+        """Return the event of an operation, or a no-op context if the client has no hooks."""
+        if hooks := self.client.hooks:
+            return Event(tuple(hooks), self.resource_name, operation, url or self.url)
+        return NO_EVENT
+
+    @classmethod
+    def plan_include(cls, *paths: str) -> str:
+        """Return the ``include`` parameter to traverse relationship paths, e.g. ``"task.project"``."""
+        planned = {}
+        for path in paths:
+            model, steps = cls, []
+            for name in path.split("."):
+                if (related_model := model.schema.related_models.get(name)) is None:
+                    raise ValueError(f"Unknown relationship {name} of {model.resource_name}")
+                model = related_model
+                steps.append(name)
+                planned[".".join(steps)] = None
+        return ",".join(planned)
+
+    @classmethod
+    def record_class(cls) -> type[records.Record]:
+        """Return the typed record class generated from the model's declarations."""
+        return cls.schema.record_class
 
     @classmethod
     @property
     def resource_name(cls):
-        return underscore(cls.__name__).replace("_", "-")
+        return resource_name_of(cls.__name__)
 
     def _parse_post_json(self, attributes: dict | None, relationships: dict | None) -> dict:
         return {
@@ -150,35 +667,97 @@ class BaseModel:
             }
         }
 
-    def _parse_attributes(self, passed_attributes: dict | None = None):
+    def _parse_patch_json(self, id, attributes: dict | None, relationships: dict | None) -> dict:
+        json = self._parse_post_json(attributes, relationships)
+        json["data"]["id"] = id
+        return json
+
+    def _parse_bulk_json(
+        self, items: Iterable[tuple[dict | None, dict | None]]
+    ) -> list[dict | transforms.SerializationError]:
+        """Serialize the payloads of many items, an invalid item gets its error instead."""
+        # the defaults are the same for every item, so they are only serialized once
+        default_attributes = self._parse_attributes()
+        default_relationships = self._parse_relationships()
+        jsons = []
+        for attributes, relationships in items:
+            try:
+                jsons.append(
+                    {
+                        "data": {
+                            "attributes": {
+                                **default_attributes,
+                                **self._parse_attributes(attributes, partial=True),
+                            },
+                            "relationships": {
+                                **default_relationships,
+                                **self._parse_relationships(relationships, partial=True),
+                            },
+                            "type": self.resource_name,
+                        }
+                    }
+                )
+            except transforms.SerializationError as e:
+                jsons.append(e)
+        return jsons
+
+    def _parse_attributes(self, passed_attributes: dict | None = None, partial=False):
         passed_attributes = passed_attributes or {}
-        attributes = self.__class__.attributes
+        attributes = self.schema.attributes
 
         return {
-            name: (transform).serialize(passed_attributes.get(name) or value)
+            name: (transform).serialize(passed_attributes.get(name) or _default(value))
             for name, value, transform in attributes
+            if not partial or passed_attributes.get(name)
         }
 
     def _parse_filters(self, passed_filters: dict | None = None):
         passed_filters = passed_filters or {}
-        filters = self.__class__.filters
+        filters = self.schema.filters
 
         return {
             name: (transform).serialize(
-                passed_filters.get(name) or value, is_filter=True, client=self.client
+                passed_filters.get(name) or _default(value), is_filter=True, client=self.client
             )
             for name, value, transform in filters
         }
 
-    def _parse_relationships(self, passed_relationships: dict | None = None):
+    def _parse_fields(
+        self, passed_fields: dict[str, Iterable[str]] | None, include: str | None = None
+    ) -> dict:
+        """Return the sparse fieldset parameters, e.g. ``{"tasks": ["name"]}``.
+
+        Relationships needed to follow the ``include`` paths are added to the fieldsets.
+        """
+        if not passed_fields:
+            return {}
+        fieldsets = {
+            resource_name: _fieldset(resource_name, names)
+            for resource_name, names in passed_fields.items()
+        }
+        for path in filter(None, (include or "").split(",")):
+            model = self.__class__
+            for name in path.split("."):
+                fieldset = fieldsets.get(model.resource_name)
+                if fieldset is not None and name not in fieldset:
+                    fieldset.append(name)
+                if (model := model.schema.related_models.get(name)) is None:
+                    break
+        return {
+            f"fields[{resource_name}]": ",".join(fieldset)
+            for resource_name, fieldset in fieldsets.items()
+        }
+
+    def _parse_relationships(self, passed_relationships: dict | None = None, partial=False):
         passed_relationships = passed_relationships or {}
-        relationships = self.__class__.relationships
+        relationships = self.schema.relationships
 
         return {
-            name: transforms.Relationship(related_model).serialize(
-                passed_relationships.get(name) or value, client=self.client
+            name: (transform).serialize(
+                passed_relationships.get(name) or _default(value), client=self.client
             )
-            for name, value, related_model in relationships
+            for name, value, transform in relationships
+            if not partial or passed_relationships.get(name)
         }
 
     @functools.cached_property
@@ -192,13 +771,23 @@ class Users(GetOnlyMixin, BaseModel):
         ("active", None, transforms.Type(bool)),
     ]
 
-    attributes = []
+    attributes = [
+        ("username", None, transforms.Type(str)),
+        ("first-name", None, transforms.Type(str)),
+        ("last-name", None, transforms.Type(str)),
+        ("email", None, transforms.Type(str)),
+        ("is-active", None, transforms.Type(bool)),
+        ("is-reviewer", None, transforms.Type(bool)),
+        ("is-accountant", None, transforms.Type(bool)),
+        ("is-superuser", None, transforms.Type(bool)),
+        ("is-staff", None, transforms.Type(bool)),
+    ]
     relationships = []
 
-    @functools.cached_property
+    @property
     def me(self):
-        """Return the current logged in user."""
-        return self.get(id="me")
+        """Return the current logged in user, it is only fetched once per client."""
+        return self.client.identity.get("me", lambda: self.get(id="me"))
 
 
 CURRENT_USER_FILTER = (
@@ -213,6 +802,7 @@ class WorktimeBalances(
     GetOnlyMixin,
     BaseModel,
 ):
+    cache_expire_after = 60
     filters = [CURRENT_USER_FILTER, DATE, FROM_DATE, TO_DATE]
     attributes = [DATE, ("balance", None, transforms.Duration)]
     relationships = [("user", None, Users)]
@@ -221,37 +811,44 @@ class WorktimeBalances(
         overtimes = super().get(*args, **kwargs)
         return (
             overtimes
-            if (kwargs.get("raw") or kwargs.get("include"))
+            if (kwargs.get("raw") or kwargs.get("include") or kwargs.get("typed"))
             else overtimes[0]["attributes"]["balance"]
         )
 
 
 class Customers(GetOnlyMixin, BaseModel):
+    cache_expire_after = 60 * 60 * 24
+    cache_stale_while_revalidate = 60 * 60 * 24 * 7
     filters = [ARCHIVED]
     attributes = [NAME, ("archived", False, transforms.Type(bool, False))]
     relationships = []
 
 
 class Projects(GetOnlyMixin, BaseModel):
+    cache_expire_after = 60 * 60 * 24
+    cache_stale_while_revalidate = 60 * 60 * 24 * 7
     filters = [("customer", None, transforms.Relationship(Customers)), ARCHIVED]
     attributes = [NAME]
     relationships = [("customer", None, Customers)]
 
 
 class Tasks(GetOnlyMixin, BaseModel):
+    cache_expire_after = 60 * 60 * 24
+    cache_stale_while_revalidate = 60 * 60 * 24 * 7
     filters = [("project", None, transforms.Relationship(Projects)), ARCHIVED]
     attributes = [NAME]
     relationships = [("project", None, Projects)]
 
 
 class Activities(BaseModel):
+    cache_expire_after = 30
     filters = [
         ("active", None, transforms.Type(bool)),
-        ("day", date.today(), transforms.Date),
+        ("day", date.today, transforms.Date),
     ]
 
     attributes = [
-        ("from-time", datetime.now().time(), transforms.Time(True)),
+        ("from-time", lambda: datetime.now().time(), transforms.Time(True)),
         ("to-time", None, transforms.Time(True)),
         ("transferred", False, transforms.Type(bool)),
         COMMENT,
@@ -265,27 +862,105 @@ class Activities(BaseModel):
         ("task", None, Tasks),
     ]
 
+    # seconds after which the locally tracked running activity is fetched again
+    current_max_age = 60
+
+    def __init__(self, client) -> None:
+        super().__init__(client)
+        # (monotonic time of the last update, running activity or {} if none is running)
+        self._current: tuple[float, dict] | None = None
+
     @property
     def current(self):
-        return (self.get({"active": True}) or [{}])[0]
+        """Return the running activity, it is only fetched if the local view is stale."""
+        if self._current_is_stale():
+            return self.refresh()
+        return self._current[1]
+
+    def refresh(self) -> dict:
+        """Fetch the running activity from the API."""
+        self._track((self.get({"active": True}, cached=False) or [{}])[0])
+        return self._current[1]
+
+    def columns(
+        self,
+        filters=None,
+        include: str | None = "task,task.project,task.project.customer",
+        page_size: int = 100,
+    ) -> columnar.Columns:
+        """Export the activities page by page into columns, see :mod:`libtimed.columnar`.
+
+        Only the fields the columns are built from are requested.
+        """
+        return columnar.activity_columns(
+            self.iter(filters, include, page_size, lazy=True, fields=columnar.ACTIVITY_FIELDS)
+        )
 
     def start(self, **kwargs):
-        if self.current:
-            self.stop()
+        self.stop()
         return self.post(**kwargs)
 
     def stop(self):
-        if self.current:
-            attributes = self.current["attributes"]
-            relationships = self.current["relationships"]
-            attributes["to-time"] = datetime.now()
-            return self.patch(self.current["id"], attributes, relationships)
+        if current := self.current:
+            attributes = {**current["attributes"], "to-time": datetime.now()}
+            return self.patch(current["id"], attributes, current["relationships"])
         return None
 
+    def post(self, *args, **kwargs) -> Response:
+        resp = super().post(*args, **kwargs)
+        self._track_response(resp)
+        return resp
+
+    def patch(self, *args, **kwargs) -> Response:
+        resp = super().patch(*args, **kwargs)
+        self._track_response(resp)
+        return resp
+
+    def delete(self, id) -> Response:
+        resp = super().delete(id)
+        self._track_delete(id)
+        return resp
+
+    def _current_is_stale(self) -> bool:
+        return self._current is None or time.monotonic() - self._current[0] > self.current_max_age
+
+    def _track(self, activity: dict) -> None:
+        self._current = (time.monotonic(), activity)
+
+    def _track_delete(self, id) -> None:
+        if self._current and self._current[1].get("id") == str(id):
+            self._current = None
+
+    def _track_response(self, resp) -> None:
+        """Update the running activity from the response to a write."""
+        if not 200 <= resp.status_code < 300 or not resp.content:
+            # the state is unknown, fetch it again on the next access
+            self._current = None
+            return
+        json = codec.loads(resp.content)
+        activity = self._deserialize(json["data"], json.get("included", []))
+        self._track({} if activity["attributes"].get("to-time") else activity)
+
 
 class Reports(BaseModel):
+    cache_expire_after = 60
+    cache_invalidates = ("worktime-balances",)
     attributes = [COMMENT, DATE, DURATION, REVIEW, NOT_BILLABLE]
 
     relationships = [CURRENT_USER_RELATIONSHIP, ("task", None, Tasks)]
 
     filters = [CURRENT_USER_FILTER, DATE, FROM_DATE, TO_DATE]
+
+    def columns(
+        self,
+        filters=None,
+        include: str | None = "task,task.project,task.project.customer",
+        page_size: int = 100,
+    ) -> columnar.Columns:
+        """Export the reports page by page into columns, see :mod:`libtimed.columnar`.
+
+        Only the fields the columns are built from are requested.
+        """
+        return columnar.report_columns(
+            self.iter(filters, include, page_size, lazy=True, fields=columnar.REPORT_FIELDS)
+        )
@@ -1,16 +1,43 @@
 #!/usr/bin/env python
 
 import base64
-import datetime
+import functools
 import http.server
 import json
+import logging
+import threading
 import time
+import weakref
 import webbrowser
 from urllib.parse import parse_qs, urlparse
 
-import keyring
 import requests
 
+logger = logging.getLogger(__name__)
+
+DEVICE_CODE_GRANT = "urn:ietf:params:oauth:grant-type:device_code"
+# seconds between polls of the device flow, unless the server asks for another interval
+DEVICE_FLOW_INTERVAL = 5
+
+
+@functools.lru_cache(maxsize=16)
+def _discover(url: str) -> dict:
+    """Fetch an OpenID configuration document, it is only fetched once per process."""
+    resp = requests.get(url)
+    resp.raise_for_status()
+    return resp.json()
+
+
+@functools.lru_cache(maxsize=64)
+def _claims(token: str) -> dict:
+    """Decode the (unverified) payload of a JWT."""
+    payload = token.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+
+
+class AuthorizationError(Exception):
+    pass
+
 
 class OIDCHTTPRequestHandler(http.server.BaseHTTPRequestHandler):
     code = None
@@ -46,11 +73,13 @@ class OIDCClient:
         self.sso_realm = sso_realm
         self.auth_path = auth_path
         self.use_device_flow = use_device_flow
+        # last token response, it holds the refresh token
+        self.tokens: dict = {}
+        # access token read from the keyring, so it is only read once
+        self._cached_token = None
 
     def autoconfig(self):
-        data = requests.get(
-            f"{self.sso_url}/realms/{self.sso_realm}/.well-known/openid-configuration"
-        ).json()
+        data = _discover(f"{self.sso_url}/realms/{self.sso_realm}/.well-known/openid-configuration")
         self.authorization_endpoint = data["authorization_endpoint"]
         self.token_endpoint = data["token_endpoint"]
         self.device_endpoint = data["device_authorization_endpoint"]
@@ -87,21 +116,29 @@ class OIDCClient:
         webbrowser.open_new(verification_uri_complete)
         # print manual instructions
         print(f"Please visit {verification_uri} and enter the code {user_code}")
-        time.sleep(5)
 
-        resp = {}
-        while "access_token" not in resp:
+        interval = auth_data.get("interval") or DEVICE_FLOW_INTERVAL
+        expires_at = time.monotonic() + auth_data.get("expires_in", float("inf"))
+        while time.monotonic() < expires_at:
+            time.sleep(interval)
             resp = requests.post(
                 self.token_endpoint,
                 data={
                     "client_id": self.client_id,
-                    "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
+                    "grant_type": DEVICE_CODE_GRANT,
                     "device_code": device_code,
                 },
             ).json()
-            print(resp)
-            time.sleep(5)
-        return resp["access_token"]
+            if "access_token" in resp:
+                self.tokens = resp
+                return resp["access_token"]
+            error = resp.get("error")
+            if error == "slow_down":
+                interval += DEVICE_FLOW_INTERVAL
+            elif error != "authorization_pending":
+                print(f"Error: {error} {resp.get('error_description', '')}")
+                return False
+        return False
 
     def get_token(self):
         # construct the token request
@@ -119,41 +156,81 @@ class OIDCClient:
             print(token_response.text)
             return False
         # get the access token
-        return token_response.json()["access_token"]
+        self.tokens = token_response.json()
+        return self.tokens["access_token"]
+
+    def refresh(self, refresh_token=None):
+        """Exchange a refresh token for a new access token, return it or False.
+
+        Without one, the refresh token of the last token response or the keyring is used.
+        """
+        refresh_token = (
+            refresh_token or self.tokens.get("refresh_token") or self.keyring_get_refresh_token()
+        )
+        if not refresh_token:
+            return False
+        if not hasattr(self, "token_endpoint"):
+            self.autoconfig()
+        token_response = requests.post(
+            self.token_endpoint,
+            data={
+                "client_id": self.client_id,
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+            },
+        )
+        if token_response.status_code != 200:
+            logger.warning("Refreshing the token failed with %s", token_response.status_code)
+            return False
+        self.tokens = {"refresh_token": refresh_token, **token_response.json()}
+        self._store(self.tokens["access_token"])
+        return self.tokens["access_token"]
+
+    def expires_at(self, token):
+        """Return the expiration time of a token as a unix timestamp."""
+        return _claims(token)["exp"]
 
     def check_expired(self, token):
-        # decode the token
-        token_parts = token.split(".")[1]
-        # Add padding
-        token_parts += "=" * ((4 - len(token_parts) % 4) % 4)
-        # Convet to bytes
-        token_bytes = token_parts.encode("ascii")
-        # base64 decode + utf-8 decode
-        token_json = base64.b64decode(token_bytes).decode("utf-8")
-        # json to dict
-        token_dict = json.loads(token_json)
-        # get the expiration time
-        expires_at = token_dict["exp"]
-        # get the current time
-        now = datetime.datetime.now()
-        # check if the token is expired
-        return now.timestamp() < expires_at
+        # despite its name, true if the token is still valid
+        return time.time() < self.expires_at(token)
 
     def keyring_get(self):
+        # keyring discovers its backends on import, which is slow
+        import keyring
+
         return keyring.get_password("system", "libtimed_token_" + self.client_id)
 
     def keyring_set(self, token):
+        import keyring
+
         keyring.set_password("system", "libtimed_token_" + self.client_id, token)
+        if refresh_token := self.tokens.get("refresh_token"):
+            keyring.set_password(
+                "system", "libtimed_refresh_token_" + self.client_id, refresh_token
+            )
+
+    def _store(self, token):
+        self.keyring_set(token)
+        self._cached_token = token
+
+    def keyring_get_refresh_token(self):
+        import keyring
+
+        return keyring.get_password("system", "libtimed_refresh_token_" + self.client_id)
 
     def authorize(self):
-        cached_token = self.keyring_get()
-        if cached_token and self.check_expired(cached_token):
-            return cached_token
+        if self._cached_token is None:
+            self._cached_token = self.keyring_get()
+        if self._cached_token and self.check_expired(self._cached_token):
+            return self._cached_token
 
         self.autoconfig()
+        # renew an expired token without user interaction if possible
+        if token := self.refresh():
+            return token
         if self.use_device_flow:
             if token := self.start_device_flow():
-                self.keyring_set(token)
+                self._store(token)
                 return token
             return False
 
@@ -161,6 +238,114 @@ class OIDCClient:
             token = self.get_token()
             if not token:
                 return False
-            self.keyring_set(token)
+            self._store(token)
             return token
         return False
+
+
+class TokenManager:
+    """Keep the access token of long running processes fresh.
+
+    The token is kept in memory and renewed with the refresh token ``refresh_margin``
+    seconds before it expires, on a background timer, so requests never wait for a renewal.
+    Every renewed token is handed to the attached clients (see :meth:`attach`). If a
+    renewal fails it is retried after ``retry_interval`` seconds, until the token expired.
+    Without a usable refresh token, :attr:`token` falls back to :meth:`OIDCClient.authorize`,
+    which may require user interaction.
+
+    .. code-block:: python
+
+        with TokenManager(oidc_client) as manager:
+            client = manager.attach(TimedAPIClient(manager.token, url, api_namespace))
+    """
+
+    def __init__(
+        self, oidc_client: OIDCClient, refresh_margin: float = 60, retry_interval: float = 10
+    ) -> None:
+        self.oidc_client = oidc_client
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self._token = None
+        self._clients = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._running = False
+
+    @property
+    def token(self) -> str:
+        """Return a valid access token, authorizing if there is none."""
+        token = self._token
+        if token and self.oidc_client.check_expired(token):
+            return token
+        with self._lock:
+            if not self._valid():
+                self._set_token(self.oidc_client.authorize())
+            return self._token
+
+    def attach(self, client):
+        """Hand the current and all renewed tokens to a client, which is returned."""
+        self._clients.add(client)
+        if self._token:
+            client.set_token(self._token)
+        return client
+
+    def start(self) -> "TokenManager":
+        """Authorize and start renewing the token in the background."""
+        with self._lock:
+            self._running = True
+            if self._valid():
+                self._schedule_renewal()
+            else:
+                self._set_token(self.oidc_client.authorize())
+        return self
+
+    def stop(self) -> None:
+        with self._lock:
+            self._running = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def __enter__(self) -> "TokenManager":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def renew(self) -> bool:
+        """Renew the token with the refresh token now, return whether it worked."""
+        try:
+            token = self.oidc_client.refresh()
+        except requests.RequestException:
+            logger.warning("Refreshing the token failed", exc_info=True)
+            token = False
+        with self._lock:
+            if token:
+                self._set_token(token)
+            elif self._running and self._valid():
+                self._schedule(self.retry_interval)
+        return bool(token)
+
+    def _valid(self) -> bool:
+        return bool(self._token) and self.oidc_client.check_expired(self._token)
+
+    def _set_token(self, token) -> None:
+        if not token:
+            raise AuthorizationError("Authorization failed")
+        self._token = token
+        for client in list(self._clients):
+            client.set_token(token)
+        self._schedule_renewal()
+
+    def _schedule_renewal(self) -> None:
+        if self._running:
+            expires_in = self.oidc_client.expires_at(self._token) - time.time()
+            # tokens living shorter than the margin are renewed halfway through
+            self._schedule(max(expires_in - self.refresh_margin, expires_in / 2, 0))
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self.renew)
+        self._timer.daemon = True
+        self._timer.start()
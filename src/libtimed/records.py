@@ -0,0 +1,49 @@
+import functools
+
+
+class Record:
+    """Compact, typed representation of a resource.
+
+    Record classes are generated per model from its ``attributes`` and ``relationships``
+    declarations and use ``__slots__``, so a record costs a fraction of the nested
+    JSON:API dicts. Related resources are records themselves and shared between all records
+    of a response. Related resources that were not included are stubs, only their ``id``
+    is set.
+    """
+
+    __slots__ = ("id",)
+
+    # (API name, field name) pairs
+    _attribute_fields: tuple[tuple[str, str], ...] = ()
+    _relationship_fields: tuple[tuple[str, str], ...] = ()
+
+    def __repr__(self):
+        fields = ("id", *(field for _, field in self._attribute_fields))
+        values = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in fields if hasattr(self, field)
+        )
+        return f"{self.__class__.__name__}({values})"
+
+
+def _field_name(name: str) -> str:
+    from inflection import underscore
+
+    return underscore(name).replace("-", "_")
+
+
+@functools.cache
+def record_class(resource_name: str, attributes: tuple[str, ...], relationships: tuple[str, ...]):
+    """Generate the record class of a resource type."""
+    from inflection import camelize
+
+    attribute_fields = tuple((name, _field_name(name)) for name in attributes)
+    relationship_fields = tuple((name, _field_name(name)) for name in relationships)
+    return type(
+        f"{camelize(_field_name(resource_name))}Record",
+        (Record,),
+        {
+            "__slots__": tuple(field for _, field in attribute_fields + relationship_fields),
+            "_attribute_fields": attribute_fields,
+            "_relationship_fields": relationship_fields,
+        },
+    )
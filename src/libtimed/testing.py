@@ -0,0 +1,354 @@
+"""In-process fake of the timed JSON:API for tests and load tests.
+
+The fake keeps resources in memory and serves them over a real local HTTP server, so clients
+exercise their whole stack, including connection pooling and the response cache. Latency
+and errors can be injected and every request is counted in :attr:`FakeTimedServer.stats`.
+
+.. code-block:: python
+
+    with FakeTimedServer(latency=0.01) as server:
+        server.add(*reports)
+        client = TimedAPIClient("token", server.url, server.api_namespace)
+        client.reports.get_all()
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# query parameters which are not filters
+RESERVED_PARAMETERS = frozenset({"include", "page[number]", "page[size]"})
+# filters which apply to a differently named attribute
+FILTER_ATTRIBUTES = {"day": "date"}
+NOT_FOUND = (404, {}, {"errors": [{"status": "404"}]})
+
+
+def _normalize(value) -> str:
+    """Return a filter value or attribute in the way query parameters encode it."""
+    if isinstance(value, bool):
+        value = int(value)
+    value = str(value)
+    return {"true": "1", "false": "0"}.get(value.lower(), value)
+
+
+def _identifier(relationship: dict | None) -> dict | None:
+    """Reduce a relationship to its resource identifier, e.g. if a whole resource was passed."""
+    data = (relationship or {}).get("data")
+    return data and {"type": data["type"], "id": str(data["id"])}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, don't let them wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.fake._count(connections=1)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._handle("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._handle("POST")
+
+    def do_PATCH(self) -> None:  # noqa: N802
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self._encode(
+            method, *self.server.fake.handle(method, self.path, body)
+        )
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/vnd.api+json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        # count before answering, so the stats are complete once the client has the response
+        self.server.fake._count(requests=1, bytes_received=len(body), bytes_sent=len(payload))
+        self.wfile.write(payload)
+
+    def _encode(
+        self, method: str, status: int, headers: dict, document: dict | None
+    ) -> tuple[int, dict, bytes]:
+        fake = self.server.fake
+        payload = b"" if document is None else json.dumps(document).encode()
+        if fake.etags and method == "GET" and status == 200:
+            etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+            headers = {**headers, "ETag": etag}
+            if self.headers.get("If-None-Match") == etag:
+                fake._count(not_modified=1)
+                return 304, headers, b""
+        if payload and fake.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload)
+            headers = {**headers, "Content-Encoding": "gzip"}
+        return status, headers, payload
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class FakeTimedServer:
+    """Fake timed API serving in-memory resources on a local port.
+
+    Collections are paginated (``page_size`` unless the request asks for another size),
+    support ``include`` paths like ``task.project.customer`` and sparse fieldsets
+    (``fields[<type>]``) and are filtered by equality on attributes and relationships,
+    ``from_date``/``to_date`` and the ``active`` filter of activities. Unknown filters are
+    ignored. ``users/me`` is the user with ``me_id``.
+
+    Every request is delayed by ``latency`` seconds and answered with ``error_status`` (and
+    ``Retry-After`` if ``retry_after`` is set) with a probability of ``error_rate``. With
+    ``compress`` set, responses are gzipped for clients accepting it. With ``etags`` set,
+    responses carry an ``ETag`` and conditional requests for unchanged ones are answered with
+    ``304 Not Modified``.
+    """
+
+    def __init__(
+        self,
+        api_namespace: str = "api/v1",
+        latency: float = 0,
+        error_rate: float = 0,
+        error_status: int = 503,
+        retry_after: int | None = None,
+        page_size: int = 100,
+        me_id: str = "1",
+        seed: int = 0,
+        compress=False,
+        etags=False,
+    ) -> None:
+        self.api_namespace = api_namespace
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.me_id = me_id
+        self.compress = compress
+        self.etags = etags
+        # type -> id -> resource
+        self.resources: dict[str, dict[str, dict]] = {}
+        self.stats: dict[str, int] = {}
+        self.reset_stats()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, *resources: dict) -> None:
+        """Store resources, replacing existing ones with the same type and id."""
+        with self._lock:
+            for resource in resources:
+                self._store(resource)
+
+    def reset_stats(self) -> None:
+        self.stats = dict.fromkeys(
+            ("requests", "errors", "not_modified", "connections", "bytes_received", "bytes_sent"),
+            0,
+        )
+
+    def start(self) -> "FakeTimedServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "FakeTimedServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def handle(self, method: str, path: str, body: bytes) -> tuple[int, dict, dict | None]:
+        """Answer a request with its status, headers and JSON document."""
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self._count(errors=1)
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after else {}
+            return self.error_status, headers, {"errors": [{"status": str(self.error_status)}]}
+
+        url = urlsplit(path)
+        prefix = f"/{self.api_namespace}/"
+        if not url.path.startswith(prefix):
+            return NOT_FOUND
+        type, _, id = url.path.removeprefix(prefix).partition("/")
+        if type == "users" and id == "me":
+            id = self.me_id
+        params = dict(parse_qsl(url.query))
+        document = json.loads(body) if body else {}
+        with self._lock:
+            return self._dispatch(method, type, id, url.path, params, document)
+
+    def _dispatch(
+        self, method: str, type: str, id: str, path: str, params: dict, document: dict
+    ) -> tuple[int, dict, dict | None]:
+        if method == "GET":
+            return self._get(type, id, params) if id else self._list(type, path, params)
+        if method == "POST":
+            return 201, {}, {"data": self._store({**document["data"], "id": None})}
+        if method == "PATCH":
+            return self._patch(type, id, document["data"])
+        if self.resources.get(type, {}).pop(id, None) is None:
+            return NOT_FOUND
+        return 204, {}, None
+
+    def _count(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                self.stats[name] += count
+
+    def _store(self, resource: dict) -> dict:
+        resources = self.resources.setdefault(resource["type"], {})
+        if resource.get("id") is None:
+            resource["id"] = str(max(map(int, resources), default=0) + 1)
+        resource = {
+            "type": resource["type"],
+            "id": str(resource["id"]),
+            "attributes": dict(resource.get("attributes") or {}),
+            "relationships": {
+                name: {"data": _identifier(relationship)}
+                for name, relationship in (resource.get("relationships") or {}).items()
+            },
+        }
+        resources[resource["id"]] = resource
+        return resource
+
+    def _get(self, type: str, id: str, params: dict) -> tuple[int, dict, dict]:
+        if (resource := self.resources.get(type, {}).get(id)) is None:
+            return NOT_FOUND
+        included = self._included([resource], params)
+        return 200, {}, self._sparse({"data": resource, "included": included}, params)
+
+    def _list(self, type: str, path: str, params: dict) -> tuple[int, dict, dict]:
+        filters = {
+            name: value
+            for name, value in params.items()
+            if name not in RESERVED_PARAMETERS and not name.startswith("fields[")
+        }
+        resources = [
+            resource
+            for resource in self.resources.get(type, {}).values()
+            if all(self._matches(resource, name, value) for name, value in filters.items())
+        ]
+        number = int(params.get("page[number]", 1))
+        size = int(params.get("page[size]", self.page_size))
+        pages = max(-(-len(resources) // size), 1)
+        data = resources[(number - 1) * size : number * size]
+        next_link = None
+        if number < pages:
+            next_link = f"{self.url}{path}?{urlencode({**params, 'page[number]': number + 1})}"
+        document = {
+            "data": data,
+            "included": self._included(data, params),
+            "links": {"next": next_link},
+            "meta": {"pagination": {"page": number, "pages": pages, "count": len(resources)}},
+        }
+        return 200, {}, self._sparse(document, params)
+
+    def _patch(self, type: str, id: str, data: dict) -> tuple[int, dict, dict]:
+        if (resource := self.resources.get(type, {}).get(id)) is None:
+            return NOT_FOUND
+        resource = self._store(
+            {
+                **resource,
+                "attributes": {**resource["attributes"], **(data.get("attributes") or {})},
+                "relationships": {
+                    **resource["relationships"],
+                    **(data.get("relationships") or {}),
+                },
+            }
+        )
+        return 200, {}, {"data": resource}
+
+    @staticmethod
+    def _matches(resource: dict, name: str, value: str) -> bool:
+        attributes = resource["attributes"]
+        if name == "active":
+            return _normalize(attributes.get("to-time") is None) == _normalize(value)
+        if name in ("from_date", "to_date"):
+            date = attributes.get("date") or ""
+            return date >= value if name == "from_date" else date <= value
+        name = FILTER_ATTRIBUTES.get(name, name)
+        if name in attributes:
+            return _normalize(attributes[name]) == _normalize(value)
+        if name in resource["relationships"]:
+            return (resource["relationships"][name]["data"] or {}).get("id") == value
+        return True
+
+    @staticmethod
+    def _sparse(document: dict, params: dict) -> dict:
+        """Apply the sparse fieldsets (``fields[<type>]``) of a request to a document."""
+        fieldsets = {
+            name.removeprefix("fields[").removesuffix("]"): set(filter(None, value.split(",")))
+            for name, value in params.items()
+            if name.startswith("fields[")
+        }
+
+        def sparse(resource):
+            if (fieldset := fieldsets.get(resource["type"])) is None:
+                return resource
+            return {
+                **resource,
+                "attributes": {
+                    name: value
+                    for name, value in resource["attributes"].items()
+                    if name in fieldset
+                },
+                "relationships": {
+                    name: value
+                    for name, value in resource["relationships"].items()
+                    if name in fieldset
+                },
+            }
+
+        data = document["data"]
+        return {
+            **document,
+            "data": list(map(sparse, data)) if isinstance(data, list) else sparse(data),
+            "included": list(map(sparse, document["included"])),
+        }
+
+    def _included(self, data: list[dict], params: dict) -> list[dict]:
+        included = {}
+        for path in filter(None, params.get("include", "").split(",")):
+            resources = data
+            for name in path.split("."):
+                identifiers = [
+                    identifier
+                    for resource in resources
+                    if (identifier := resource["relationships"].get(name, {}).get("data"))
+                ]
+                resources = [
+                    related
+                    for identifier in identifiers
+                    if (related := self.resources.get(identifier["type"], {}).get(identifier["id"]))
+                ]
+                included.update(((r["type"], r["id"]), r) for r in resources)
+        primary = {(resource["type"], resource["id"]) for resource in data}
+        return [resource for key, resource in included.items() if key not in primary]
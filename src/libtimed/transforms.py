@@ -1,8 +1,13 @@
-from collections.abc import Callable
+import functools
+from collections.abc import Callable, Iterable
 from datetime import date, datetime, time, timedelta
 from enum import Enum as EnumClass
 
 TIME_FORMAT = "%H:%M:%S"
+# the date strptime uses for times, kept for backwards compatibility of Time(True)
+TIME_BASE_DATE = date(1900, 1, 1)
+# number of distinct values the parse caches hold, values repeat a lot across resources
+PARSE_CACHE_SIZE = 4096
 
 
 class SerializationError(ValueError):
@@ -22,6 +27,14 @@ class BaseTransform:
         """Deserialize a value from the API so that it can be used in a pythonic way."""
         return value_from_api
 
+    def serialize_many(self, values: Iterable) -> list:
+        """Serialize many values at once."""
+        return [self.serialize(value) for value in values]
+
+    def deserialize_many(self, values: Iterable) -> list:
+        """Deserialize many values at once, e.g. a whole page of resources."""
+        return list(map(self.deserialize, values))
+
 
 class Type(BaseTransform):
     """Transform for types."""
@@ -55,20 +68,30 @@ class Duration(BaseTransform):
             return duration
 
         Type(timedelta, False).serialize(duration)
-        days = ""
-        if duration.days != 0:
-            days = str(duration.days) + " "
-        hours, minutes, seconds = str(duration).split(" ")[-1].split(":")
-        return f"{days}{hours.zfill(2)}:{minutes}:{seconds}"
+        days = f"{duration.days} " if duration.days else ""
+        minutes, seconds = divmod(duration.seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        # same as the clock part of str(timedelta), but with zero padded hours
+        microseconds = f".{duration.microseconds:06d}" if duration.microseconds else ""
+        return f"{days}{hours:02d}:{minutes:02d}:{seconds:02d}{microseconds}"
 
     @staticmethod
+    @functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
     def deserialize(duration: str) -> timedelta:
         # TODO: add validation
-        days = 0
-        if len(duration.split(" ")) != 1:
-            days, duration = duration.split(" ")
-        hours, minutes, seconds = map(int, duration.split(":"))
-        return timedelta(days=int(days), hours=hours, minutes=minutes, seconds=seconds)
+        days, _, clock = duration.rpartition(" ")
+        hours, minutes, seconds = clock.split(":")
+        return timedelta(
+            days=int(days or 0), hours=int(hours), minutes=int(minutes), seconds=int(seconds)
+        )
+
+    @staticmethod
+    def serialize_many(durations: Iterable[timedelta | str]) -> list[str]:
+        return list(map(Duration.serialize, durations))
+
+    @staticmethod
+    def deserialize_many(durations: Iterable[str]) -> list[timedelta]:
+        return list(map(Duration.deserialize, durations))
 
 
 class RelationShipProperty:
@@ -89,7 +112,8 @@ class Relationship(BaseTransform):
         client=None,
     ) -> dict | str | None:
         if not value:
-            return {"data": None}
+            # an unset filter is left out of the query instead of filtering for nothing
+            return None if is_filter else {"data": None}
         if isinstance(value, dict):
             return value
         data = {}
@@ -133,8 +157,17 @@ class Date(BaseTransform):
         return value if value is None else value.isoformat()
 
     @staticmethod
+    @functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
     def deserialize(value_from_api) -> date:
-        return datetime.strptime(value_from_api, "%Y-%m-%d").date()
+        return date.fromisoformat(value_from_api)
+
+    @staticmethod
+    def serialize_many(values: Iterable[date | str]) -> list[str]:
+        return list(map(Date.serialize, values))
+
+    @staticmethod
+    def deserialize_many(values: Iterable[str]) -> list[date]:
+        return list(map(Date.deserialize, values))
 
 
 class Time(BaseTransform):
@@ -162,7 +195,12 @@ class Time(BaseTransform):
         return value.strftime(TIME_FORMAT) if value else None
 
     def deserialize(self, value) -> time | datetime | None:
-        return self._return_value(datetime.strptime(value, "%H:%M:%S")) if value else None
+        return self._return_value(_parse_time(value)) if value else None
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_time(value: str) -> datetime:
+    return datetime.combine(TIME_BASE_DATE, time.fromisoformat(value))
 
 
 class Enum(BaseTransform):
@@ -0,0 +1,99 @@
+"""Connection pool, retries and timeouts of the synchronous client."""
+
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util import Retry
+
+# methods which can be sent again without changing the outcome
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PATCH", "DELETE"})
+# overloaded, rate limited or unreachable upstream, the request was not processed
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTP adapter which applies a default timeout to requests without one."""
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] | None,
+        socket_options: list[tuple] | None = None,
+        **kwargs,
+    ) -> None:
+        # set before the pool manager is created in HTTPAdapter.__init__
+        self.timeout = timeout
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        try:
+            return super().send(
+                request, timeout=self.timeout if timeout is None else timeout, **kwargs
+            )
+        except requests.ConnectionError as e:
+            # requests reports read timeouts which exhausted the retries as connection errors
+            if isinstance(getattr(e.args[0] if e.args else None, "reason", None), ReadTimeoutError):
+                raise requests.ReadTimeout(e, request=request) from e
+            raise
+
+
+class Transport:
+    """Connection pool, retry policy and default timeout shared by the sessions of a client.
+
+    Idempotent requests are retried on connection errors and ``RETRY_STATUS_CODES``, POST requests
+    only on connection errors.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block=False,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        backoff_max: float = 30,
+        timeout: float | tuple[float, float] | None = 30,
+        tcp_keepalive=False,
+    ) -> None:
+        self.retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            backoff_max=backoff_max,
+            allowed_methods=RETRY_METHODS,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        socket_options = None
+        if tcp_keepalive:
+            socket_options = [
+                *HTTPConnection.default_socket_options,
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            ]
+        self.adapter = TimeoutHTTPAdapter(
+            timeout,
+            socket_options,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry,
+            pool_block=pool_block,
+        )
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """Route all requests of a session through the shared connection pool."""
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        return session
+
+    def close(self) -> None:
+        self.adapter.close()
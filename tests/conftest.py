@@ -0,0 +1,49 @@
+import pytest
+
+from libtimed import TimedAPIClient
+from libtimed.testing import FakeTimedServer
+
+
+@pytest.fixture()
+def server():
+    with FakeTimedServer(page_size=10) as server:
+        yield server
+
+
+@pytest.fixture()
+def client(server, tmp_path, monkeypatch):
+    # the response cache lives in the user's cache directory
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return TimedAPIClient("token", server.url, server.api_namespace)
+
+
+@pytest.fixture()
+def _reports(server):
+    server.add(
+        {"type": "users", "id": "1", "attributes": {"username": "me"}},
+        {"type": "customers", "id": "1", "attributes": {"name": "Customer"}},
+        {
+            "type": "projects",
+            "id": "1",
+            "attributes": {"name": "Project"},
+            "relationships": {"customer": {"data": {"type": "customers", "id": "1"}}},
+        },
+        {
+            "type": "tasks",
+            "id": "1",
+            "attributes": {"name": "Task"},
+            "relationships": {"project": {"data": {"type": "projects", "id": "1"}}},
+        },
+        *(
+            {
+                "type": "reports",
+                "id": str(id),
+                "attributes": {"date": "2024-01-02", "duration": "01:00:00", "comment": ""},
+                "relationships": {
+                    "task": {"data": {"type": "tasks", "id": "1"}},
+                    "user": {"data": {"type": "users", "id": "1"}},
+                },
+            }
+            for id in range(1, 26)
+        ),
+    )
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from libtimed.aio import AsyncTimedAPIClient  # noqa: E402
+
+
+@pytest.fixture()
+def _resources(server):
+    server.add(
+        {"type": "users", "id": "1", "attributes": {"username": "me"}},
+        {"type": "customers", "id": "1", "attributes": {"name": "Customer"}},
+        {
+            "type": "projects",
+            "id": "1",
+            "attributes": {"name": "Project"},
+            "relationships": {"customer": {"data": {"type": "customers", "id": "1"}}},
+        },
+        *(
+            {
+                "type": "reports",
+                "id": str(id),
+                "attributes": {"date": "2024-01-02", "duration": "01:00:00", "comment": ""},
+                "relationships": {"user": {"data": {"type": "users", "id": "1"}}},
+            }
+            for id in range(1, 26)
+        ),
+    )
+
+
+def run(server, test):
+    """Run a coroutine function with an async client talking to the fake server."""
+
+    async def main():
+        async with AsyncTimedAPIClient("token", server.url, server.api_namespace) as client:
+            return await test(client)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.usefixtures("_resources")
+def test_get(server):
+    async def test(client):
+        return await client.projects.get(include="customer", id=1)
+
+    project = run(server, test)
+    assert project["attributes"]["name"] == "Project"
+    assert project["relationships"]["customer"]["attributes"]["name"] == "Customer"
+
+
+@pytest.mark.usefixtures("_resources")
+def test_get_all_gathers_pages(server):
+    async def test(client):
+        return await client.reports.get_all({"date": "2024-01-02"}, page_size=10)
+
+    reports = run(server, test)
+    assert [report["id"] for report in reports] == [str(id) for id in range(1, 26)]
+    assert reports[0]["attributes"]["duration"] == timedelta(hours=1)
+    # users/me and three pages
+    assert server.stats["requests"] == 4
+
+
+@pytest.mark.usefixtures("_resources")
+def test_gather_fan_out(server):
+    async def test(client):
+        return await asyncio.gather(
+            client.users.me, client.customers.get(), client.customers.get(id=1), client.users.me
+        )
+
+    me, customers, customer, me_again = run(server, test)
+    assert me is me_again
+    assert customers == [customer]
+    # the current user is only fetched once
+    assert server.stats["requests"] == 3
+
+
+@pytest.mark.usefixtures("_resources")
+def test_start_and_stop_activity(server):
+    async def test(client):
+        await client.activities.start(attributes={"comment": "async"})
+        started = await client.activities.current
+        await client.activities.stop()
+        return started, await client.activities.current, await client.activities.refresh()
+
+    started, current, refreshed = run(server, test)
+    assert started["attributes"]["comment"] == "async"
+    assert started["relationships"]["user"]["data"]["id"] == "1"
+    assert current == refreshed == {}
+    [activity] = server.resources["activities"].values()
+    assert activity["attributes"]["to-time"] is not None
+
+
+@pytest.mark.parametrize(
+    ("name", "args"),
+    [("bulk_post", ([],)), ("bulk_delete", ([],)), ("columns", ()), ("export", ("out.csv",))],
+)
+def test_sync_only_apis(server, name, args):
+    async def test(client):
+        getattr(client.reports, name)(*args)
+
+    with pytest.raises(NotImplementedError):
+        run(server, test)
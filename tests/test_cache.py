@@ -0,0 +1,71 @@
+import threading
+import time
+
+from libtimed.cache import IdentityCache, LRUCache
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_lru_eviction_and_expiry():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=0)
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats == {"hits": 1, "stale_hits": 0, "misses": 2, "size": 1}
+
+
+def test_get_or_load_serves_stale_entries_while_refreshing():
+    cache = LRUCache()
+    loads = iter(range(10))
+    refreshing = threading.Event()
+
+    def refresh():
+        refreshing.wait()
+        return next(loads)
+
+    assert cache.get_or_load("key", lambda: next(loads), ttl=0.01, stale_ttl=60) == 0
+    time.sleep(0.02)
+
+    # stale entries are returned while a single refresh runs in the background
+    assert cache.get_or_load("key", lambda: next(loads), 0.01, 60, refresh) == 0
+    assert cache.get_or_load("key", lambda: next(loads), 0.01, 60, refresh) == 0
+    refreshing.set()
+    wait_for(lambda: not cache._refreshing)
+
+    assert cache.get_or_load("key", lambda: next(loads), 0.01, 60, refresh) == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_get_or_load_without_stale_ttl():
+    cache = LRUCache()
+    loads = iter(range(10))
+
+    assert cache.get_or_load("key", lambda: next(loads), ttl=0.01) == 0
+    time.sleep(0.02)
+    assert cache.get_or_load("key", lambda: next(loads), ttl=0.01) == 1
+
+
+def test_identity_cache():
+    cache = IdentityCache(ttl=0.05)
+    loads = iter(range(10))
+
+    assert cache.get("me", lambda: next(loads)) == 0
+    assert cache.get("me", lambda: next(loads)) == 0
+    assert cache.get("other", lambda: next(loads)) == 1
+    time.sleep(0.06)
+    assert cache.get("me", lambda: next(loads)) == 2
+
+    cache.invalidate("me")
+    assert cache.get("me", lambda: next(loads)) == 3
+    assert cache.get("other", lambda: next(loads)) == 4
+    cache.invalidate()
+    assert cache.get("other", lambda: next(loads)) == 5
@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.fixture()
+def _catalog(server):
+    server.add(
+        {"type": "customers", "id": "1", "attributes": {"name": "Acme", "archived": False}},
+        *(
+            {
+                "type": "projects",
+                "id": str(id),
+                "attributes": {"name": name, "archived": False},
+                "relationships": {"customer": {"data": {"type": "customers", "id": "1"}}},
+            }
+            for id, name in [(1, "Website"), (2, "Warehouse")]
+        ),
+        *(
+            {
+                "type": "tasks",
+                "id": str(id),
+                "attributes": {"name": f"Task {id}", "archived": False},
+                "relationships": {"project": {"data": {"type": "projects", "id": str(1 + id % 2)}}},
+            }
+            for id in range(1, 11)
+        ),
+    )
+
+
+def test_projects_without_filters_are_not_filtered(client):
+    assert client.projects._page_params(None, None, 500)["customer"] is None
+
+
+@pytest.mark.usefixtures("_catalog")
+def test_sync(client, server):
+    assert client.catalog.sync() == {"customers": 1, "projects": 2, "tasks": 10}
+
+    customer = client.catalog.get("customers", 1)
+    assert [entry["name"] for entry in client.catalog.search("w")] == ["Warehouse", "Website"]
+    assert sorted(project["id"] for project in client.catalog.children(customer)) == ["1", "2"]
+    website = client.catalog.get("projects", 1)
+    assert sorted(int(task["id"]) for task in client.catalog.children(website)) == [2, 4, 6, 8, 10]
+    assert client.catalog.path(client.catalog.get("tasks", 3)) == [
+        customer,
+        client.catalog.get("projects", 2),
+        client.catalog.get("tasks", 3),
+    ]
+
+    # unchanged, within max_age
+    assert client.catalog.sync() == {"customers": 0, "projects": 0, "tasks": 0}
+
+    server.add({**server.resources["tasks"]["1"], "attributes": {"name": "Renamed"}})
+    del server.resources["tasks"]["2"]
+    assert client.catalog.sync(force=True) == {"customers": 0, "projects": 0, "tasks": 2}
+    assert client.catalog.search("renamed") == [client.catalog.get("tasks", 1)]
+    assert client.catalog.get("tasks", 2) is None
+    assert len(client.catalog.children(website)) == 4
@@ -0,0 +1,390 @@
+import gc
+import time
+from datetime import date, timedelta
+
+import pytest
+import requests
+
+from libtimed import TimedAPIClient, models, transforms
+from libtimed.models import Customers, LazyAttributes, Reports
+
+from .test_cache import wait_for
+
+DAY = date(2024, 1, 2)
+
+
+@pytest.mark.usefixtures("_reports")
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_get_all_follows_pagination(client, server, max_workers):
+    reports = client.reports.get_all(
+        {"date": DAY}, "task,task.project", 10, max_workers, cached=False
+    )
+
+    assert [report["id"] for report in reports] == [str(id) for id in range(1, 26)]
+    assert reports[0]["attributes"]["duration"] == timedelta(hours=1)
+    project = reports[0]["relationships"]["task"]["relationships"]["project"]
+    assert project["attributes"]["name"] == "Project"
+    # users/me and three pages
+    assert server.stats["requests"] == 4
+
+
+@pytest.mark.usefixtures("_reports")
+def test_included_resources_are_shared(client):
+    reports = client.reports.get({"date": DAY}, "task,task.project", cached=False)
+
+    task = reports[0]["relationships"]["task"]
+    assert all(report["relationships"]["task"] is task for report in reports)
+    assert task["relationships"]["project"]["attributes"]["name"] == "Project"
+
+
+def test_cyclic_relationships(client):
+    def relationship(type, id):
+        return {"data": {"type": type, "id": id}}
+
+    document = {
+        "data": [
+            {
+                "type": "reports",
+                "id": "1",
+                "attributes": {"duration": "01:00:00"},
+                "relationships": {"task": relationship("tasks", "1")},
+            }
+        ],
+        "included": [
+            {
+                "type": "tasks",
+                "id": "1",
+                "attributes": {"name": "Task"},
+                "relationships": {"project": relationship("projects", "1")},
+            },
+            {
+                "type": "projects",
+                "id": "1",
+                "attributes": {"name": "Project"},
+                "relationships": {"task": relationship("tasks", "1")},
+            },
+        ],
+    }
+
+    [report] = client.reports._parse_get_response(document, None)
+
+    task = report["relationships"]["task"]
+    project = task["relationships"]["project"]
+    assert project["relationships"]["task"] is task
+    assert report["attributes"]["duration"] == timedelta(hours=1)
+
+
+@pytest.mark.usefixtures("_reports")
+def test_cached_get(client, server):
+    client.reports.get({"date": DAY})
+    requests = server.stats["requests"]
+
+    assert len(client.reports.get({"date": DAY})) == 10
+    assert server.stats["requests"] == requests
+
+
+@pytest.mark.usefixtures("_reports")
+def test_activity_start_and_stop(client, server):
+    def round_trips():
+        count = server.stats["requests"]
+        server.reset_stats()
+        return count
+
+    assert client.users.me["id"] == "1"
+    round_trips()
+
+    client.activities.start(attributes={"comment": "Work"}, relationships={"task": "1"})
+    # the running activity is looked up once, then the new one is posted
+    assert round_trips() == 2
+
+    assert client.activities.current["attributes"]["comment"] == "Work"
+    # the running activity is known from the response of the post
+    assert round_trips() == 0
+
+    client.activities.start(attributes={"comment": "More"}, relationships={"task": "1"})
+    # the running activity is stopped and the new one posted
+    assert round_trips() == 2
+    assert server.resources["activities"]["1"]["attributes"]["to-time"] is not None
+    assert client.activities.current["attributes"]["comment"] == "More"
+
+    client.activities.stop()
+    assert round_trips() == 1
+
+    assert client.activities.current == {}
+    assert round_trips() == 0
+    assert server.resources["activities"]["2"]["attributes"]["to-time"] is not None
+
+
+@pytest.mark.usefixtures("_reports")
+def test_current_user_is_fetched_once(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    client = TimedAPIClient("token", server.url, server.api_namespace, identity_ttl=0.2)
+    me = client.users.me
+    assert client.users.me is me
+    client.reports.get({"date": DAY}, cached=False)
+    client.reports.post({"comment": "a"}, {"task": "1"})
+    # users/me, the reports and the post, the current user is shared by all models
+    assert server.stats["requests"] == 3
+
+    # expired after identity_ttl
+    time.sleep(0.2)
+    me = client.users.me
+    assert server.stats["requests"] == 4
+    assert client.users.me is me
+
+    client.identity.invalidate()
+    client.reports.get({"date": DAY}, cached=False)
+    # users/me and the reports
+    assert server.stats["requests"] == 6
+
+
+def test_injected_errors(client, server):
+    server.error_rate = 1
+    server.retry_after = 3
+
+    resp = client.session.post(client.reports.url, json={})
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "3"
+    assert server.stats["errors"] == 1
+
+
+def test_plan_include(client):
+    assert client.reports.plan_include("task.project.customer", "user", "task") == (
+        "task,task.project,task.project.customer,user"
+    )
+    with pytest.raises(ValueError, match="Unknown relationship customer of tasks"):
+        client.reports.plan_include("task.customer")
+
+
+def test_parse_fields(client):
+    assert client.reports._parse_fields(
+        {"reports": ["date", "duration"], "tasks": ["name"], "projects": "name"},
+        "task,task.project",
+    ) == {
+        "fields[reports]": "date,duration,task",
+        "fields[tasks]": "name,project",
+        "fields[projects]": "name",
+    }
+    assert client.reports._parse_fields({"users": ["username", "email"]}, "user") == {
+        "fields[users]": "username,email"
+    }
+    with pytest.raises(ValueError, match="Unknown fields of reports: name"):
+        client.reports._parse_fields({"reports": ["name"]})
+    with pytest.raises(ValueError, match="Unknown resource type employments"):
+        client.reports._parse_fields({"employments": ["name"]})
+
+
+@pytest.mark.usefixtures("_reports")
+def test_sparse_fieldsets(client):
+    include = client.reports.plan_include("task.project")
+    reports = client.reports.get(
+        {"date": DAY}, include, fields={"reports": ["duration"], "tasks": []}
+    )
+
+    assert reports[0]["attributes"] == {"duration": timedelta(hours=1)}
+    task = reports[0]["relationships"]["task"]
+    assert task["attributes"] == {}
+    assert task["relationships"]["project"]["attributes"]["name"] == "Project"
+
+
+def test_lazy_attributes():
+    calls = []
+
+    class Upper(transforms.BaseTransform):
+        @staticmethod
+        def deserialize(value):
+            calls.append(value)
+            return value.upper()
+
+    attributes = LazyAttributes({"name": "task", "comment": "raw"}, {"name": Upper()})
+
+    assert calls == []
+    assert attributes["name"] == attributes["name"] == "TASK"
+    # deserialized once and memoized
+    assert calls == ["task"]
+    assert attributes["comment"] == "raw"
+
+    attributes["name"] = "set"
+    attributes["new"] = 1
+    del attributes["comment"]
+    assert dict(attributes) == {"name": "set", "new": 1}
+    assert calls == ["task"]
+
+
+@pytest.mark.usefixtures("_reports")
+@pytest.mark.parametrize("method", ["get", "iter", "get_all"])
+def test_lazy_models(client, method):
+    [report, *_] = getattr(client.reports, method)({"date": DAY}, "task", lazy=True)
+    attributes = report["attributes"]
+    task_attributes = report["relationships"]["task"]["attributes"]
+
+    assert isinstance(attributes, LazyAttributes)
+    # included resources are lazy as well
+    assert isinstance(task_attributes, LazyAttributes)
+    assert attributes._values == task_attributes._values == {}
+
+    duration = attributes["duration"]
+    assert duration == timedelta(hours=1)
+    assert attributes["duration"] is duration
+    assert list(attributes._values) == ["duration"]
+    assert task_attributes["name"] == "Task"
+
+
+def test_stale_while_revalidate(client, server, monkeypatch):
+    monkeypatch.setattr(Customers, "cache_expire_after", 1)
+    server.etags = True
+    server.add({"type": "customers", "id": "1", "attributes": {"name": "Customer"}})
+    client.customers.get()
+    time.sleep(1.1)
+    server.reset_stats()
+
+    # the stale response is returned right away and revalidated in the background
+    assert client.customers.get()[0]["attributes"]["name"] == "Customer"
+    wait_for(lambda: server.stats["not_modified"] == 1)
+    assert server.stats["requests"] == 1
+
+
+@pytest.mark.usefixtures("_reports")
+def test_iter_typed_keeps_only_related_records(client):
+    record_class = client.reports.record_class()
+    tasks = set()
+    for report in client.reports.iter({"date": DAY}, "task", page_size=10, typed=True):
+        tasks.add(id(report.task))
+        live = sum(isinstance(obj, record_class) for obj in gc.get_objects())
+        # the records of earlier pages are released
+        assert live <= 10
+    # the task record is shared across pages
+    assert len(tasks) == 1
+
+
+@pytest.mark.usefixtures("_reports")
+def test_memory_cache(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    client = TimedAPIClient(
+        "token", server.url, server.api_namespace, memory_cache_size=8, memory_cache_ttl=3600
+    )
+    customers = client.customers.get()
+    reports = client.reports.get({"date": DAY})
+    server.reset_stats()
+
+    assert client.customers.get() == customers
+    assert client.reports.get({"date": DAY}) == reports
+    assert server.stats["requests"] == 0
+    assert client.memory_cache.stats == {"hits": 2, "stale_hits": 0, "misses": 2, "size": 2}
+
+    now = time.monotonic()
+    expires = {key[0]: entry[0] - now for key, entry in client.memory_cache._entries.items()}
+    # customers are cached for a day, but the memory cache keeps entries for an hour at most
+    assert 3500 < expires["customers"] <= 3600
+    # reports are only cached for as long as the model allows
+    assert 0 < expires["reports"] <= Reports.cache_expire_after
+
+    client.reports.post({"comment": "new"}, {"task": "1"})
+    assert [key[0] for key in client.memory_cache._entries] == ["customers"]
+    assert len(client.reports.get({"date": DAY})) == 10
+    assert client.customers.get() == customers
+    # the post and the reports, the customers are still served from memory
+    assert server.stats["requests"] == 2
+    assert client.memory_cache.stats == {"hits": 3, "stale_hits": 0, "misses": 3, "size": 2}
+
+
+def test_writes_evict_cached_responses(client, server, tmp_path):
+    server.add({"type": "users", "id": "1", "attributes": {"username": "me"}})
+    client.reports.post({"comment": "a"}, {"user": "1"})
+    # there was nothing cached, so the response cache wasn't opened
+    assert "cached_session" not in vars(client)
+
+    assert len(client.reports.get(cached=True)) == 1
+    client.customers.get()
+    # a second client stands in for another process sharing the response cache
+    other = TimedAPIClient("token", server.url, server.api_namespace)
+    other.reports.post({"comment": "b"}, {"user": "1"})
+
+    server.reset_stats()
+    assert len(client.reports.get(cached=True)) == 2
+    client.customers.get()
+    # only the reports were evicted, the customers are still served from the cache
+    assert server.stats["requests"] == 1
+
+
+@pytest.mark.usefixtures("_reports")
+def test_bulk_results_are_in_input_order(client):
+    results = client.reports.bulk_post(
+        [({"comment": f"Report {i}"}, None) for i in range(20)], max_workers=4
+    )
+    comments = [resp.json()["data"]["attributes"]["comment"] for resp in results]
+    assert comments == [f"Report {i}" for i in range(20)]
+
+    ids = [resp.json()["data"]["id"] for resp in results]
+    results = client.reports.bulk_patch([(id, {"comment": id}, None) for id in ids])
+    assert [resp.json()["data"]["attributes"]["comment"] for resp in results] == ids
+
+
+def test_bulk_partial_failure(client, server, monkeypatch):
+    server.add(*({"type": "reports", "id": str(id), "attributes": {}} for id in (1, 3)))
+    request = client.session.request
+
+    def refuse_second(method, url, **kwargs):
+        if url.endswith("/4"):
+            raise requests.ConnectionError("refused")
+        return request(method, url, **kwargs)
+
+    monkeypatch.setattr(client.session, "request", refuse_second)
+    results = client.reports.bulk_delete([1, 2, 3, 4])
+
+    assert [getattr(result, "status_code", None) for result in results] == [204, 404, 204, None]
+    assert isinstance(results[3], requests.ConnectionError)
+    assert server.resources["reports"] == {}
+
+
+@pytest.mark.usefixtures("_reports")
+def test_bulk_post_retries(client, server, monkeypatch):
+    # the default user of the reports is fetched before the errors start
+    assert client.users.me["id"] == "1"
+    server.reset_stats()
+    sleeps = []
+    monkeypatch.setattr(models.time, "sleep", sleeps.append)
+    server.error_rate = 1
+    server.retry_after = 3600
+
+    [resp] = client.reports.bulk_post([({"comment": "a"}, None)], retries=2)
+
+    assert resp.status_code == 503
+    assert server.stats["requests"] == 3
+    # Retry-After is capped at the backoff_max of the transport
+    assert sleeps == [30, 30]
+
+    sleeps.clear()
+    server.reset_stats()
+    server.retry_after = None
+    server.error_rate = 0.5
+    results = client.reports.bulk_post([({"comment": "a"}, None)] * 4, max_workers=1)
+    assert [resp.status_code for resp in results] == [201] * 4
+    assert server.stats["errors"] == len(sleeps) > 0
+    assert set(sleeps) <= {0.5, 1, 2}
+
+
+def test_response_cache_is_scoped_to_the_token(client, server):
+    server.add({"type": "customers", "id": "1", "attributes": {"name": "Customer"}})
+    client.customers.get()
+    server.reset_stats()
+
+    TimedAPIClient("token", server.url, server.api_namespace).customers.get()
+    assert server.stats["requests"] == 0
+    # another token doesn't get the cached responses of the first one
+    TimedAPIClient("other", server.url, server.api_namespace).customers.get()
+    assert server.stats["requests"] == 1
+
+
+@pytest.mark.usefixtures("_reports")
+def test_bulk_invalid_items_do_not_abort_the_batch(client, server):
+    results = client.reports.bulk_post([({"comment": "a"}, None), ({"comment": 1}, None)])
+
+    assert results[0].status_code == 201
+    assert isinstance(results[1], transforms.SerializationError)
+    assert len(server.resources["reports"]) == 26
+
+    results = client.reports.bulk_patch([(1, {"comment": 1}, None), (2, {"comment": "b"}, None)])
+    assert isinstance(results[0], transforms.SerializationError)
+    assert results[1].json()["data"]["attributes"]["comment"] == "b"
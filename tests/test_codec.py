@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from libtimed import TimedAPIClient, codec
+
+DOCUMENT = {
+    "data": [
+        {"type": "customers", "id": "1", "attributes": {"name": "Ä", "archived": False}},
+        {"type": "customers", "id": "2", "attributes": {"name": None, "rate": 1.5}},
+    ],
+    "meta": {"pagination": {"page": 1, "pages": 1, "count": 2}},
+}
+
+
+def test_loads():
+    assert codec.loads(json.dumps(DOCUMENT).encode()) == DOCUMENT
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_decode_responses(server, tmp_path, monkeypatch, compress):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    server.compress = compress
+    server.add(*DOCUMENT["data"])
+    client = TimedAPIClient("token", server.url, server.api_namespace)
+
+    expected = [{**item, "relationships": {}} for item in DOCUMENT["data"]]
+    assert client.customers.get(cached=False) == expected
+    assert client.customers.get(cached=True) == expected
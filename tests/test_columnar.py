@@ -0,0 +1,178 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from libtimed.columnar import EPOCH_ORDINAL, MISSING, activity_columns, report_columns
+
+numpy = pytest.importorskip("numpy")
+
+HOUR = 3600
+# id, date, hours, task (and with that project and customer)
+REPORTS = [
+    (1, "2024-01-01", 1, 1),
+    (2, "2024-01-07", 2, 1),
+    (3, "2024-01-08", 0.5, 2),
+    (4, "2024-02-15", 1, 2),
+    (5, "2025-03-01", 3, 1),
+]
+
+
+def _task(id: int) -> dict:
+    """Return a deserialized task with its project and customer included."""
+    customer = {"type": "customers", "id": str(id), "attributes": {}}
+    project = {"type": "projects", "id": str(id), "relationships": {"customer": customer}}
+    return {"type": "tasks", "id": str(id), "relationships": {"project": project}}
+
+
+def _report(id: int, day: str, hours: float, task: int) -> dict:
+    return {
+        "type": "reports",
+        "id": str(id),
+        "attributes": {"date": date.fromisoformat(day), "duration": timedelta(hours=hours)},
+        "relationships": {
+            "user": {"data": {"type": "users", "id": "1"}},
+            "task": _task(task),
+        },
+    }
+
+
+@pytest.fixture()
+def columns():
+    return report_columns(_report(*report) for report in REPORTS)
+
+
+def _dates(values) -> list[str]:
+    return [str(value) for value in values]
+
+
+def test_report_columns(columns):
+    assert len(columns) == 5
+    assert list(columns["id"]) == [1, 2, 3, 4, 5]
+    assert columns["date"][0] == date(2024, 1, 1).toordinal() - EPOCH_ORDINAL
+    assert _dates(columns.numpy("date")) == [day for _, day, *_ in REPORTS]
+    assert list(columns["duration"]) == [HOUR, 2 * HOUR, HOUR // 2, HOUR, 3 * HOUR]
+    assert list(columns["user"]) == [1] * 5
+    assert list(columns["task"]) == list(columns["project"]) == list(columns["customer"])
+    assert list(columns["task"]) == [1, 1, 2, 2, 1]
+    # the NumPy arrays share the buffers of the columns
+    columns["duration"][0] = 0
+    assert columns.numpy("duration")[0] == 0
+
+
+def test_report_columns_without_includes():
+    report = _report(1, "2024-01-01", 1, 1)
+    report["relationships"]["task"] = {"data": {"type": "tasks", "id": "7"}}
+    del report["attributes"]["duration"]
+
+    columns = report_columns([report])
+
+    assert [columns[name][0] for name in ("duration", "task", "project", "customer")] == [
+        0,
+        7,
+        MISSING,
+        MISSING,
+    ]
+
+
+def test_bucket(columns):
+    assert _dates(columns.bucket("date", "day")) == _dates(columns.numpy("date"))
+    assert _dates(columns.bucket("date", "week")) == [
+        "2024-01-01",
+        "2024-01-01",
+        "2024-01-08",
+        "2024-02-12",
+        "2025-02-24",
+    ]
+    assert _dates(columns.bucket("date", "month")) == [
+        "2024-01-01",
+        "2024-01-01",
+        "2024-01-01",
+        "2024-02-01",
+        "2025-03-01",
+    ]
+    assert _dates(columns.bucket("date", "year")) == ["2024-01-01"] * 4 + ["2025-01-01"]
+    with pytest.raises(ValueError, match="Unknown bucket quarter"):
+        columns.bucket("date", "quarter")
+
+
+def test_group_sum(columns):
+    totals = columns.group_sum("project")
+    assert list(totals["project"]) == [1, 2]
+    assert list(totals["duration"]) == [6 * HOUR, HOUR + HOUR // 2]
+
+    totals = columns.group_sum(["customer", "date"], bucket="month")
+    assert list(totals["customer"]) == [1, 1, 2, 2]
+    assert _dates(totals["date"]) == ["2024-01-01", "2025-03-01", "2024-01-01", "2024-02-01"]
+    assert list(totals["duration"]) == [3 * HOUR, 3 * HOUR, HOUR // 2, HOUR]
+
+    totals = columns.group_sum("date", "id", bucket="week")
+    assert _dates(totals["date"]) == ["2024-01-01", "2024-01-08", "2024-02-12", "2025-02-24"]
+    assert list(totals["id"]) == [3, 3, 4, 5]
+
+
+def test_activity_columns():
+    def activity(id, from_time, to_time, task):
+        return {
+            "id": str(id),
+            "attributes": {
+                "date": date(2024, 1, 2),
+                "from-time": datetime.fromisoformat(f"2024-01-02T{from_time}"),
+                "to-time": to_time and datetime.fromisoformat(f"2024-01-02T{to_time}"),
+            },
+            "relationships": {"user": {"data": {"id": "1"}}, "task": _task(task)},
+        }
+
+    columns = activity_columns(
+        [
+            activity(1, "08:00", "09:30", 1),
+            activity(2, "10:00", "10:15", 2),
+            # still running
+            activity(3, "11:00", None, 2),
+        ]
+    )
+
+    assert list(columns["id"]) == [1, 2, 3]
+    assert list(columns["duration"]) == [HOUR + HOUR // 2, HOUR // 4, 0]
+    assert list(columns["customer"]) == [1, 2, 2]
+
+    totals = columns.group_sum(["date", "task"])
+    assert _dates(totals["date"]) == ["2024-01-02"] * 2
+    assert list(totals["task"]) == [1, 2]
+    assert list(totals["duration"]) == [HOUR + HOUR // 2, HOUR // 4]
+
+
+def test_model_columns(client, server):
+    server.add(
+        {"type": "users", "id": "1", "attributes": {"username": "me"}},
+        {"type": "customers", "id": "1", "attributes": {"name": "C"}},
+        {
+            "type": "projects",
+            "id": "1",
+            "relationships": {"customer": {"data": {"type": "customers", "id": "1"}}},
+        },
+        {
+            "type": "tasks",
+            "id": "1",
+            "relationships": {"project": {"data": {"type": "projects", "id": "1"}}},
+        },
+        *(
+            {
+                "type": "reports",
+                "id": str(id),
+                "attributes": {"date": "2024-01-02", "duration": "00:30:00", "comment": "x"},
+                "relationships": {
+                    "task": {"data": {"type": "tasks", "id": "1"}},
+                    "user": {"data": {"type": "users", "id": "1"}},
+                },
+            }
+            for id in range(1, 6)
+        ),
+    )
+
+    columns = client.reports.columns({"date": date(2024, 1, 2)}, page_size=2)
+
+    assert list(columns["id"]) == [1, 2, 3, 4, 5]
+    assert list(columns["customer"]) == [1] * 5
+    assert columns.group_sum("customer")["duration"].tolist() == [5 * HOUR // 2]
+    # users/me and three pages
+    assert server.stats["requests"] == 4
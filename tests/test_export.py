@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import pytest
+
+from .test_client import DAY
+
+INCLUDE = "task,task.project,task.project.customer"
+FIELDNAMES = [
+    "id",
+    "comment",
+    "date",
+    "duration",
+    "review",
+    "not-billable",
+    "user",
+    "task",
+    "task.project",
+    "task.project.customer",
+    "task.name",
+    "task.project.name",
+    "task.project.customer.name",
+]
+ROW = {
+    "id": "1",
+    "comment": "",
+    "date": "2024-01-02",
+    "duration": "01:00:00",
+    "review": None,
+    "not-billable": None,
+    "user": "1",
+    "task": "1",
+    "task.project": "1",
+    "task.project.customer": "1",
+    "task.name": "Task",
+    "task.project.name": "Project",
+    "task.project.customer.name": "Customer",
+}
+
+
+@pytest.mark.usefixtures("_reports")
+def test_export_csv(client, server, tmp_path):
+    path = tmp_path / "reports.csv"
+
+    assert client.reports.export(path, filters={"date": DAY}, include=INCLUDE, page_size=10) == 25
+
+    with path.open(newline="") as file:
+        reader = csv.DictReader(file)
+        rows = list(reader)
+    assert reader.fieldnames == FIELDNAMES
+    assert [row["id"] for row in rows] == [str(id) for id in range(1, 26)]
+    # csv writes None as an empty string
+    assert rows[0] == {name: value or "" for name, value in ROW.items()}
+    # users/me and three pages
+    assert server.stats["requests"] == 4
+
+
+@pytest.mark.usefixtures("_reports")
+def test_export_ndjson(client):
+    file = io.StringIO()
+
+    assert client.reports.export(file, "ndjson", {"date": DAY}, INCLUDE, page_size=10) == 25
+
+    rows = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert len(rows) == 25
+    assert list(rows[0]) == FIELDNAMES
+    assert rows[0] == ROW
+
+
+@pytest.mark.usefixtures("_reports")
+def test_export_without_includes(client):
+    file = io.StringIO()
+    client.reports.export(file, "ndjson", {"date": DAY})
+
+    row = json.loads(file.getvalue().splitlines()[0])
+    # related ids are exported, but there are no names without the includes
+    assert (row["user"], row["task"]) == ("1", "1")
+    assert "task.name" not in row
+
+
+def test_export_unknown_format(client):
+    with pytest.raises(ValueError, match="Unknown format xlsx"):
+        client.reports.export(io.StringIO(), "xlsx")
@@ -0,0 +1,136 @@
+import pytest
+import requests
+
+from libtimed import TimedAPIClient, Transport
+from libtimed.instrumentation import NO_EVENT, PHASES, Stats
+
+
+@pytest.fixture()
+def events(client):
+    events = []
+    client.hooks.append(events.append)
+    return events
+
+
+@pytest.fixture()
+def _customers(server):
+    server.add(
+        *({"type": "customers", "id": str(id), "attributes": {"name": "C"}} for id in range(25))
+    )
+
+
+def test_no_event_without_hooks(client):
+    assert client.customers._event("get") is NO_EVENT
+
+
+@pytest.mark.usefixtures("_customers")
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_get_all_event(client, events, server, max_workers):
+    client.customers.get_all(page_size=10, max_workers=max_workers, cached=False)
+
+    [event] = events
+    assert (event.model, event.operation, event.status, event.error) == (
+        "customers",
+        "get_all",
+        200,
+        None,
+    )
+    assert event.requests == 3
+    assert event.bytes == server.stats["bytes_sent"]
+    assert (event.cache_hits, event.cache_misses, event.retries) == (0, 0, 0)
+    assert event.phases["network"] > 0
+    assert event.phases["decode"] > 0
+    assert event.phases["deserialize"] > 0
+    assert event.phases["cache"] == 0
+
+
+@pytest.mark.usefixtures("_customers")
+def test_iter_event_is_emitted_once_exhausted(client, events):
+    customers = client.customers.iter(page_size=10, cached=False)
+    next(customers)
+    assert events == []
+    list(customers)
+    assert [(event.operation, event.requests) for event in events] == [("iter", 3)]
+
+
+@pytest.mark.usefixtures("_customers")
+def test_cache_hits_and_misses(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    events = []
+    client = TimedAPIClient(
+        "token", server.url, server.api_namespace, memory_cache_size=8, hooks=[events.append]
+    )
+
+    client.customers.get()
+    client.customers.get()
+    client.memory_cache.clear()
+    client.customers.get()
+
+    assert [(event.requests, event.cache_hits, event.cache_misses) for event in events] == [
+        (1, 0, 1),
+        # served by the memory cache
+        (0, 1, 0),
+        # served by the response cache
+        (1, 1, 0),
+    ]
+    assert events[1].phases["network"] == 0
+    assert events[1].phases["cache"] > 0
+
+
+def test_write_events(client, events, server):
+    server.add({"type": "users", "id": "1", "attributes": {"username": "me"}})
+    client.reports.post({"comment": "a"}, {"task": "1", "user": "1"})
+    client.reports.patch("1", {"comment": "b"})
+    client.reports.bulk_delete(["1", "2"])
+
+    assert [(event.operation, event.status, event.requests) for event in events] == [
+        ("post", 201, 1),
+        # the current user is fetched for the default relationship
+        ("get", 200, 1),
+        ("patch", 200, 1),
+        ("bulk_delete", 404, 2),
+    ]
+
+
+def test_retries_and_errors(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    events = []
+    client = TimedAPIClient(
+        "token",
+        server.url,
+        server.api_namespace,
+        transport=Transport(retries=1, backoff_factor=0, backoff_jitter=0),
+        hooks=[events.append],
+    )
+    server.error_rate = 1
+
+    client.customers.get(cached=False)
+
+    def refuse(*args, **kwargs):
+        raise requests.ConnectionError("refused")
+
+    monkeypatch.setattr(client.session, "get", refuse)
+    with pytest.raises(requests.ConnectionError):
+        client.customers.get(cached=False)
+
+    assert (events[0].status, events[0].retries, events[0].error) == (503, 1, None)
+    assert isinstance(events[1].error, requests.ConnectionError)
+
+
+@pytest.mark.usefixtures("_customers")
+def test_stats(client):
+    stats = Stats(buckets=(0.5, 1))
+    client.hooks.append(stats)
+    client.customers.get_all(page_size=10, cached=False)
+    client.customers.get_all(page_size=10, cached=False)
+
+    snapshot = stats.snapshot()
+    assert list(snapshot) == ["customers.get_all"]
+    entry = snapshot["customers.get_all"]
+    assert (entry["count"], entry["errors"], entry["requests"]) == (2, 0, 6)
+    assert set(entry["phases"]) == set(PHASES)
+    assert sum(entry["histogram"].values()) == 2
+    assert list(entry["histogram"]) == [0.5, 1, float("inf")]
+
+    stats.reset()
+    assert stats.snapshot() == {}
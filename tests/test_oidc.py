@@ -0,0 +1,146 @@
+import base64
+import json
+import time
+
+import pytest
+
+from libtimed import TimedAPIClient, oidc
+from libtimed.oidc import OIDCClient, TokenManager
+
+from .test_cache import wait_for
+
+
+def _jwt(expires_in: float) -> str:
+    payload = json.dumps({"exp": time.time() + expires_in, "jti": time.perf_counter()})
+    encoded = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+    return f"header.{encoded}.signature"
+
+
+class _Response:
+    def __init__(self, data: dict, status_code: int = 200) -> None:
+        self.data = data
+        self.status_code = status_code
+
+    def json(self) -> dict:
+        return self.data
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+@pytest.fixture()
+def oidc_client(monkeypatch):
+    oidc._discover.cache_clear()
+    keyring = {}
+    monkeypatch.setattr(OIDCClient, "keyring_get", lambda self: keyring.get("token"))
+    monkeypatch.setattr(
+        OIDCClient, "keyring_get_refresh_token", lambda self: keyring.get("refresh_token")
+    )
+    monkeypatch.setattr(
+        OIDCClient,
+        "keyring_set",
+        lambda self, token: keyring.update(token=token, refresh_token=self.tokens["refresh_token"]),
+    )
+    monkeypatch.setattr(oidc.webbrowser, "open_new", lambda url: None)
+    monkeypatch.setattr(
+        oidc.requests,
+        "get",
+        lambda url: _Response(
+            {
+                "authorization_endpoint": "https://sso/auth",
+                "token_endpoint": "https://sso/token",
+                "device_authorization_endpoint": "https://sso/device",
+            }
+        ),
+    )
+    client = OIDCClient("timedctl", "https://sso", "example", "timedctl/auth", True)
+    client.keyring = keyring
+    return client
+
+
+def _token_endpoint(monkeypatch, *responses):
+    posted = []
+    responses = iter(responses)
+
+    def post(url, data):
+        posted.append((url, data))
+        return _Response(next(responses))
+
+    monkeypatch.setattr(oidc.requests, "post", post)
+    return posted
+
+
+def test_check_expired(oidc_client):
+    assert oidc_client.check_expired(_jwt(60))
+    assert not oidc_client.check_expired(_jwt(-60))
+
+
+def test_autoconfig_fetches_discovery_once(oidc_client, monkeypatch):
+    urls = []
+    get = oidc.requests.get
+    monkeypatch.setattr(oidc.requests, "get", lambda url: urls.append(url) or get(url))
+    oidc_client.autoconfig()
+    oidc_client.autoconfig()
+    assert len(urls) == 1
+    assert oidc_client.token_endpoint == "https://sso/token"
+
+
+def test_device_flow_honours_interval(oidc_client, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(oidc.time, "sleep", sleeps.append)
+    token = _jwt(60)
+    _token_endpoint(
+        monkeypatch,
+        {
+            "verification_uri_complete": "",
+            "verification_uri": "",
+            "device_code": "d",
+            "user_code": "u",
+            "interval": 2,
+        },
+        {"error": "authorization_pending"},
+        {"error": "slow_down"},
+        {"access_token": token, "refresh_token": "refresh"},
+    )
+    assert oidc_client.authorize() == token
+    assert sleeps == [2, 2, 7]
+    assert oidc_client.keyring == {"token": token, "refresh_token": "refresh"}
+
+
+def test_authorize_refreshes_expired_token(oidc_client, monkeypatch):
+    oidc_client.keyring.update(token=_jwt(-60), refresh_token="refresh")
+    token = _jwt(60)
+    posted = _token_endpoint(monkeypatch, {"access_token": token})
+    assert oidc_client.authorize() == token
+    assert posted == [
+        (
+            "https://sso/token",
+            {"client_id": "timedctl", "grant_type": "refresh_token", "refresh_token": "refresh"},
+        )
+    ]
+    # served from memory from now on
+    oidc_client.keyring.clear()
+    assert oidc_client.authorize() == token
+
+
+def test_token_manager_renews_in_background(oidc_client, monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    first, second = _jwt(0.4), _jwt(60)
+    # a still valid token from an earlier run, its refresh token is only in the keyring
+    oidc_client.keyring.update(token=first, refresh_token="refresh")
+    posted = _token_endpoint(monkeypatch, {"access_token": second})
+
+    with TokenManager(oidc_client, refresh_margin=30) as manager:
+        client = manager.attach(TimedAPIClient(manager.token, "http://localhost", "api/v1"))
+        assert client.session.headers["Authorization"] == f"Bearer {first}"
+        wait_for(lambda: manager._token == second)
+        assert client.session.headers["Authorization"] == f"Bearer {second}"
+        assert client.cached_session.headers["Authorization"] == f"Bearer {second}"
+    assert [data["refresh_token"] for _, data in posted] == ["refresh"]
+    assert manager._timer is None
+
+
+def test_token_manager_authorization_failure(oidc_client, monkeypatch):
+    monkeypatch.setattr(OIDCClient, "authorize", lambda self: False)
+    with pytest.raises(oidc.AuthorizationError):
+        TokenManager(oidc_client).start()
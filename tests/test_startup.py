@@ -0,0 +1,70 @@
+import json
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+
+from libtimed import TimedAPIClient, aio, transforms
+from libtimed.models import resource_name_of
+
+# generous budgets, the point is to catch heavy imports creeping back in
+IMPORT_BUDGET = 1.0
+CONSTRUCT_BUDGET = 0.05
+# optional or slow dependencies only imported once the feature using them is
+LAZY_MODULES = ("asyncio", "httpx", "inflection", "keyring", "numpy", "requests_cache")
+
+SCRIPT = """
+import json, sys, time
+
+start = time.perf_counter()
+import libtimed
+import libtimed.oidc
+imported = time.perf_counter()
+libtimed.TimedAPIClient("token", "http://localhost", "api/v1")
+constructed = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "construct": constructed - imported,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def startup(tmp_path_factory):
+    env = {"XDG_CACHE_HOME": str(tmp_path_factory.mktemp("cache"))}
+    output = subprocess.check_output([sys.executable, "-c", SCRIPT], env=env, text=True)
+    return json.loads(output)
+
+
+def test_startup_time(startup):
+    assert startup["import"] < IMPORT_BUDGET
+    assert startup["construct"] < CONSTRUCT_BUDGET
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_lazy_import(startup, module):
+    assert module not in startup["modules"]
+
+
+def test_async_client_is_exported():
+    import libtimed
+
+    assert libtimed.AsyncTimedAPIClient is aio.AsyncTimedAPIClient
+
+
+def test_callable_defaults_are_evaluated_per_call(monkeypatch):
+    client = TimedAPIClient("token", "http://localhost", "api/v1")
+    days = iter([date(2024, 1, 1), date(2024, 1, 2)])
+    monkeypatch.setattr(
+        client.reports.schema, "attributes", [("date", lambda: next(days), transforms.Date)]
+    )
+    assert client.reports._parse_attributes() == {"date": "2024-01-01"}
+    assert client.reports._parse_attributes() == {"date": "2024-01-02"}
+    assert client.reports._parse_attributes({"date": date(2023, 1, 1)}) == {"date": "2023-01-01"}
+
+
+def test_resource_name_of():
+    assert resource_name_of("WorktimeBalances") == "worktime-balances"
+    assert resource_name_of("Users") == "users"
@@ -0,0 +1,85 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from libtimed import transforms
+
+DURATIONS = [
+    timedelta(),
+    timedelta(minutes=5),
+    timedelta(hours=8, minutes=30, seconds=15),
+    timedelta(hours=23, minutes=59, seconds=59),
+    timedelta(days=1, hours=2),
+    timedelta(days=3, hours=14, minutes=7, seconds=1),
+    timedelta(hours=-1),
+    timedelta(days=-2, hours=5),
+    timedelta(hours=1, microseconds=250),
+]
+
+
+def serialize_duration_reference(duration: timedelta) -> str:
+    days = ""
+    if duration.days != 0:
+        days = str(duration.days) + " "
+    hours, minutes, seconds = str(duration).split(" ")[-1].split(":")
+    return f"{days}{hours.zfill(2)}:{minutes}:{seconds}"
+
+
+def deserialize_duration_reference(duration: str) -> timedelta:
+    days = 0
+    if len(duration.split(" ")) != 1:
+        days, duration = duration.split(" ")
+    hours, minutes, seconds = map(int, duration.split(":"))
+    return timedelta(days=int(days), hours=hours, minutes=minutes, seconds=seconds)
+
+
+@pytest.mark.parametrize("duration", DURATIONS)
+def test_duration_serialize(duration):
+    assert transforms.Duration.serialize(duration) == serialize_duration_reference(duration)
+
+
+@pytest.mark.parametrize("duration", [d for d in DURATIONS if not d.microseconds])
+def test_duration_deserialize(duration):
+    serialized = serialize_duration_reference(duration)
+    assert transforms.Duration.deserialize(serialized) == deserialize_duration_reference(serialized)
+    assert transforms.Duration.deserialize(serialized) == duration
+
+
+def test_duration_passes_strings_through():
+    assert transforms.Duration.serialize("01:00:00") == "01:00:00"
+
+
+@pytest.mark.parametrize("value", ["2024-01-01", "1999-12-31", "2024-02-29", "0001-01-01"])
+def test_date_deserialize(value):
+    assert transforms.Date.deserialize(value) == datetime.strptime(value, "%Y-%m-%d").date()
+
+
+@pytest.mark.parametrize("value", ["00:00:00", "08:30:00", "23:59:59"])
+@pytest.mark.parametrize("return_datetime", [False, True])
+def test_time_deserialize(value, return_datetime):
+    transform = transforms.Time(return_datetime)
+    reference = datetime.strptime(value, "%H:%M:%S")
+    expected = reference if return_datetime else reference.time()
+    assert transform.deserialize(value) == expected
+    assert transform.deserialize(None) is None
+
+
+def test_deserialize_many():
+    durations = [serialize_duration_reference(d) for d in DURATIONS if not d.microseconds]
+    assert transforms.Duration.deserialize_many(durations) == [
+        deserialize_duration_reference(d) for d in durations
+    ]
+    assert transforms.Date.deserialize_many(["2024-01-01", "2024-01-01", "2024-01-02"]) == [
+        date(2024, 1, 1),
+        date(2024, 1, 1),
+        date(2024, 1, 2),
+    ]
+    assert transforms.Time().deserialize_many(["08:00:00", None]) == [time(8), None]
+    assert transforms.Type(str).deserialize_many(["a", "b"]) == ["a", "b"]
+
+
+def test_serialize_many():
+    assert transforms.Duration.serialize_many(DURATIONS) == [
+        serialize_duration_reference(d) for d in DURATIONS
+    ]
+    assert transforms.Date.serialize_many([date(2024, 1, 1), None]) == ["2024-01-01", None]
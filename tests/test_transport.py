@@ -0,0 +1,62 @@
+import time
+
+import pytest
+import requests
+
+from libtimed import TimedAPIClient, Transport
+
+
+@pytest.fixture()
+def make_client(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return lambda **kwargs: TimedAPIClient(
+        "token", server.url, server.api_namespace, transport=Transport(**kwargs)
+    )
+
+
+def test_sessions_share_the_connection_pool(client, server):
+    server.add({"type": "customers", "id": "1", "attributes": {"name": "Customer"}})
+
+    client.customers.get(cached=False)
+    client.customers.get(cached=True)
+    client.session.get(client.customers.url)
+
+    assert server.stats["requests"] == 3
+    assert server.stats["connections"] == 1
+
+
+def test_retries_idempotent_requests(make_client, server):
+    client = make_client(retries=2, backoff_factor=0, backoff_jitter=0)
+    server.error_rate = 1
+
+    assert client.session.get(client.reports.url).status_code == 503
+    assert server.stats["requests"] == 3
+
+    server.reset_stats()
+    assert client.session.post(client.reports.url, json={}).status_code == 503
+    assert server.stats["requests"] == 1
+
+
+def test_honors_retry_after(make_client, server):
+    client = make_client(retries=1, backoff_factor=0, backoff_jitter=0)
+    server.error_rate = 1
+    server.retry_after = 1
+
+    start = time.monotonic()
+    client.session.get(client.reports.url)
+
+    assert time.monotonic() - start >= 1
+    assert server.stats["requests"] == 2
+
+
+def test_default_timeout(make_client, server):
+    client = make_client(retries=0, timeout=0.05)
+    server.latency = 0.5
+
+    with pytest.raises(requests.ReadTimeout, match="Read timed out"):
+        client.session.get(client.reports.url)
+
+    # also once the retries are exhausted
+    client = make_client(retries=1, backoff_factor=0, backoff_jitter=0, timeout=0.05)
+    with pytest.raises(requests.ReadTimeout):
+        client.session.get(client.reports.url)